@@ -0,0 +1,99 @@
+import random
+from pathlib import Path
+
+from groceries.io import items_to_csv_chunked
+from groceries.item import GrocerArea, Item, KitchenArea, Priority, Supply
+
+SIZES: tuple[int, ...] = (1_000, 100_000, 1_000_000)
+SEED: int = 1
+
+# fmt: off
+NOUNS: tuple[str, ...] = (
+    "apple", "banana", "bread", "butter", "carrot", "cheese", "chicken", "cereal",
+    "coffee", "cookie", "corn", "cream", "eggs", "flour", "garlic", "grape",
+    "ham", "honey", "ice cream", "jam", "juice", "lemon", "lettuce", "milk",
+    "mushroom", "oats", "olive oil", "onion", "orange", "paprika", "pasta", "peas",
+    "pepper", "pizza", "potato", "rice", "salmon", "salt", "sausage", "spinach",
+    "steak", "sugar", "tea", "tomato", "tortilla", "turkey", "vinegar", "yogurt",
+)
+MODIFIERS: tuple[str, ...] = (
+    "organic", "fresh", "frozen", "smoked", "whole", "sliced", "low fat", "large",
+    "small", "red", "green", "sweet", "spicy", "wholegrain", "family size", "store brand",
+)
+# fmt: on
+
+PRIORITY_WEIGHTS: dict[Priority, float] = {
+    Priority.WEEKLY: 0.3,
+    Priority.MONTHLY: 0.3,
+    Priority.LESS_OFTEN: 0.3,
+    Priority.NOT_NEEDED: 0.1,
+}
+SUPPLY_WEIGHTS: dict[Supply, float] = {
+    Supply.NEEDED: 0.15,
+    Supply.RUNNING_LOW: 0.2,
+    Supply.SUPPLIED: 0.5,
+    Supply.EXTRA: 0.15,
+}
+GROCER_WEIGHTS: dict[GrocerArea, float] = {
+    GrocerArea.AISLE: 0.4,
+    GrocerArea.DAIRY: 0.12,
+    GrocerArea.DELI: 0.08,
+    GrocerArea.MEAT: 0.1,
+    GrocerArea.FROZEN: 0.12,
+    GrocerArea.PRODUCE: 0.18,
+}
+KITCHEN_WEIGHTS: dict[GrocerArea, dict[KitchenArea, float]] = {
+    GrocerArea.AISLE: {
+        KitchenArea.PANTRY: 0.5,
+        KitchenArea.SNACK: 0.2,
+        KitchenArea.BAKING: 0.15,
+        KitchenArea.SPICE: 0.15,
+    },
+    GrocerArea.DAIRY: {KitchenArea.FRIDGE: 1.0},
+    GrocerArea.DELI: {KitchenArea.FRIDGE: 0.9, KitchenArea.FREEZER: 0.1},
+    GrocerArea.MEAT: {KitchenArea.FRIDGE: 0.6, KitchenArea.FREEZER: 0.4},
+    GrocerArea.FROZEN: {KitchenArea.FREEZER: 1.0},
+    GrocerArea.PRODUCE: {KitchenArea.FRIDGE: 0.5, KitchenArea.PANTRY: 0.5},
+}
+PRICE_MU: float = 1.3
+PRICE_SIGMA: float = 0.7
+MIN_PRICE: float = 0.25
+
+
+def make_items(rows: int, seed: int = SEED, prefix: str = "") -> list[Item]:
+    """Make rows items with unique names, enum fields drawn from realistic weights.
+
+    Kitchen area depends on grocer area, frozen food going in the freezer and so on, prices are log normal.
+    Names are a modifier and a noun followed by the row number, with prefix before it to tell batches apart.
+    """
+    rng = random.Random(seed)
+    priorities = _draw(rng, PRIORITY_WEIGHTS, rows)
+    supplies = _draw(rng, SUPPLY_WEIGHTS, rows)
+    grocer_areas = _draw(rng, GROCER_WEIGHTS, rows)
+    kitchen_areas = {
+        area: iter(_draw(rng, weights, grocer_areas.count(area)))
+        for area, weights in KITCHEN_WEIGHTS.items()
+    }
+    return [
+        Item(
+            name=f"{rng.choice(MODIFIERS)} {rng.choice(NOUNS)} {prefix}{row}",
+            price=max(MIN_PRICE, round(rng.lognormvariate(PRICE_MU, PRICE_SIGMA), 2)),
+            priority=priorities[row],
+            supply=supplies[row],
+            grocer_area=grocer_areas[row],
+            kitchen_area=next(kitchen_areas[grocer_areas[row]]),
+        )
+        for row in range(rows)
+    ]
+
+
+def write_dataset(rows: int, path: Path, seed: int = SEED) -> list[Item]:
+    """Write a dataset of rows items to csv at path, returning the items."""
+    items = make_items(rows, seed)
+    items_to_csv_chunked(items, path)
+    return items
+
+
+def _draw(rng: random.Random, weights: dict, rows: int) -> list:
+    """Draw rows members by weight."""
+    return rng.choices(list(weights), weights=list(weights.values()), k=rows)
@@ -0,0 +1,315 @@
+"""Time grocery list load, export, edits, filters, search and list rendering at several dataset sizes.
+
+Run from the repository root, results are printed as JSON or written to --output:
+
+    python -m benchmarks.run --sizes 1000 100000 --output results.json
+    python -m benchmarks.run --baseline results.json
+
+GUI callbacks run against stub widgets unless --tk is given, which needs a display (e.g. under xvfb-run).
+"""
+
+import json
+import platform
+import statistics
+import sys
+import tempfile
+from argparse import ArgumentParser
+from importlib.util import find_spec
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from benchmarks.data import SEED, SIZES, make_items, write_dataset
+from groceries.constants import EMPTY
+from groceries.grocer_list import GroceryList
+from groceries.gui import ADDED_TEXT, GROCER_TEXT, GUI, HEIGHT_PX, KEEP_TEXT
+from groceries.io import (
+    PANDAS_ENGINE,
+    items_from_csv,
+    items_to_csv,
+    items_to_csv_chunked,
+)
+from groceries.item import GrocerArea, Item, KitchenArea, Priority, Supply
+
+REPEAT: int = 3
+MUTATION_OPS: int = 1000
+SEARCH_TERM: str = "apple"
+FUZZY_TERM: str = "tomatoe sliced"
+FILTERS: dict[str, list] = {
+    "priorities": [Priority.WEEKLY, Priority.MONTHLY],
+    "supplies": [Supply.NEEDED, Supply.RUNNING_LOW],
+    "kitchen": [KitchenArea.FRIDGE, KitchenArea.PANTRY],
+    "grocer": [GrocerArea.PRODUCE, GrocerArea.DAIRY, GrocerArea.AISLE],
+}
+STUB_ROW_HEIGHT_PX: int = 48
+REGRESSION_THRESHOLD: float = 1.25
+
+Result = dict[str, Any]
+
+
+class StubWidget:
+    """Stands in for any Tk widget, every method taking anything, doing nothing and returning 0."""
+
+    def __getattr__(self, name: str) -> Callable[..., int]:
+        return self._call
+
+    @staticmethod
+    def _call(*args: Any, **kwargs: Any) -> int:
+        return 0
+
+
+class StubVar:
+    """Stands in for a Tk variable, holding its value in Python."""
+
+    def __init__(self, value: Any = 0) -> None:
+        self.value = value
+
+    def get(self) -> Any:
+        return self.value
+
+    def set(self, value: Any) -> None:
+        self.value = value
+
+
+def headless_gui(grocery: GroceryList) -> GUI:
+    """GUI over grocery with stub widgets, enough to run list and filter callbacks without Tk."""
+    gui = GUI.__new__(GUI)
+    gui.grocery = grocery
+    gui.show_list = []
+    gui.applied_filters = {}
+    gui.search_term = StubVar(EMPTY)
+    gui.search_job = None
+    gui.fuzzy = StubVar(0)
+    gui.sort_by = StubVar(ADDED_TEXT)
+    gui.select_mode = StubVar(0)
+    gui.selected = set()
+    gui.selection_text = StubVar(EMPTY)
+    gui.bulk_supply = StubVar(KEEP_TEXT)
+    gui.bulk_priority = StubVar(KEEP_TEXT)
+    gui.filterprior = {mem: StubVar() for mem in Priority}
+    gui.filtersupply = {mem: StubVar() for mem in Supply}
+    gui.filterkitchen = {mem: StubVar() for mem in KitchenArea}
+    gui.filtergrocer = {mem: StubVar() for mem in GrocerArea}
+    gui.canvas = StubWidget()
+    gui.row_height = STUB_ROW_HEIGHT_PX
+    gui.list_bg = EMPTY
+    gui.list_items = [StubWidget() for _ in range(HEIGHT_PX // gui.row_height + 2)]
+    gui.list_windows = list(range(len(gui.list_items)))
+    gui.drawn_rows = [None] * len(gui.list_items)
+    gui.shown_search = EMPTY
+    gui.shown_fuzzy = False
+    gui.shown_order = None
+    gui.list_dirty = False
+    gui.redraw_job = None
+    gui.summary_text = StubVar(EMPTY)
+    gui.summary_job = None
+    return gui
+
+
+def measure(func: Callable[[], Any], repeat: int = REPEAT) -> Result:
+    """Call func repeat times, returning min, median and mean seconds per call."""
+    times = []
+    for _ in range(repeat):
+        began = perf_counter()
+        func()
+        times.append(perf_counter() - began)
+    return summarize(times)
+
+
+def summarize(times: list[float], ops: int = 1) -> Result:
+    """Timing summary of runs of ops operations each, in seconds per operation."""
+    per_op = [time / ops for time in times]
+    return {
+        "min": min(per_op),
+        "median": statistics.median(per_op),
+        "mean": statistics.fmean(per_op),
+        "runs": len(times),
+        "ops": ops,
+    }
+
+
+def bench_io(path: Path, items: list[Item], repeat: int) -> dict[str, Result]:
+    """Time reading and writing csv of items, pandas engines only if pandas is installed."""
+    out = path.with_name("out.csv")
+    results = {
+        "items_from_csv": measure(lambda: items_from_csv(path), repeat),
+        "items_to_csv_chunked": measure(
+            lambda: items_to_csv_chunked(items, out), repeat
+        ),
+    }
+    if find_spec("pandas") is not None:
+        results["items_from_csv[pandas]"] = measure(
+            lambda: items_from_csv(path, engine=PANDAS_ENGINE), repeat
+        )
+        results["items_to_csv[pandas]"] = measure(
+            lambda: items_to_csv(items, out), repeat
+        )
+    return results
+
+
+def bench_mutations(grocery: GroceryList, rows: int, repeat: int) -> dict[str, Result]:
+    """Time add, update then delete of a batch of new items, per operation, leaving grocery as it was."""
+    ops = min(rows, MUTATION_OPS)
+    times: dict[str, list[float]] = {"add": [], "update": [], "delete": []}
+    for run in range(repeat):
+        batch = make_items(ops, seed=SEED + run + 1, prefix=f"new{run}-")
+        updated = [
+            Item(
+                item.name,
+                item.price * 2,
+                item.priority,
+                Supply.EXTRA,
+                item.grocer_area,
+                item.kitchen_area,
+            )
+            for item in batch
+        ]
+        for op, items in (("add", batch), ("update", updated), ("delete", updated)):
+            method = getattr(grocery, op)
+            began = perf_counter()
+            for item in items:
+                method(item)
+            times[op].append(perf_counter() - began)
+    return {op: summarize(op_times, ops) for op, op_times in times.items()}
+
+
+def bench_filters(grocery: GroceryList, repeat: int) -> dict[str, Result]:
+    """Time each filter method over whole item list."""
+    item_list = grocery.item_list
+    return {
+        "filter_priorities": measure(
+            lambda: grocery.filter_priorities(item_list, FILTERS["priorities"]), repeat
+        ),
+        "filter_supplies": measure(
+            lambda: grocery.filter_supplies(item_list, FILTERS["supplies"]), repeat
+        ),
+        "filter_kitchen": measure(
+            lambda: grocery.filter_kitchen(item_list, FILTERS["kitchen"]), repeat
+        ),
+        "filter_grocer": measure(
+            lambda: grocery.filter_grocer(item_list, FILTERS["grocer"]), repeat
+        ),
+    }
+
+
+def bench_gui(gui: GUI, repeat: int) -> dict[str, Result]:
+    """Time list remakes for a search, a fuzzy search, a sort and an apply of filters, then a bulk edit."""
+    results = {}
+    gui.search_term.set(SEARCH_TERM)
+    results["make_list[search]"] = measure(gui._make_list, repeat)
+    gui.fuzzy.set(1)
+    gui.search_term.set(FUZZY_TERM)
+    results["make_list[fuzzy]"] = measure(gui._make_list, repeat)
+    gui.fuzzy.set(0)
+    gui.search_term.set(EMPTY)
+    gui.sort_by.set(GROCER_TEXT)
+    results["make_list[sorted]"] = measure(gui._make_list, repeat)
+    gui.sort_by.set(ADDED_TEXT)
+    for boxes, key in (
+        (gui.filterprior, "priorities"),
+        (gui.filtersupply, "supplies"),
+        (gui.filterkitchen, "kitchen"),
+        (gui.filtergrocer, "grocer"),
+    ):
+        for member in FILTERS[key]:
+            boxes[member].set(1)
+    results["apply_filters"] = measure(gui._apply_filters, repeat)
+    names = [item.name for item in gui.show_list[:MUTATION_OPS]]
+    gui.bulk_supply.set(Supply.SUPPLIED.value)
+
+    def set_selected() -> None:
+        gui.selected.update(names)
+        gui._set_selected()
+
+    results["set_selected"] = measure(set_selected, repeat)
+    return results
+
+
+def bench_size(rows: int, repeat: int, use_tk: bool) -> list[Result]:
+    """Run every benchmark over a generated dataset of rows items."""
+    results: dict[str, Result] = {}
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / "grocery_list.csv"
+        items = write_dataset(rows, path)
+        results.update(bench_io(path, items, repeat))
+        build = {}
+        results["grocery_list_build"] = measure(
+            lambda: build.update(grocery=GroceryList(items, outpath=path)), repeat
+        )
+        grocery = build["grocery"]
+        results.update(bench_mutations(grocery, rows, repeat))
+        results.update(bench_filters(grocery, repeat))
+        gui = GUI(grocery) if use_tk else headless_gui(grocery)
+        if use_tk:
+            gui.withdraw()
+        results.update(bench_gui(gui, repeat))
+        if use_tk:
+            gui.destroy()
+    return [{"rows": rows, "case": case, **result} for case, result in results.items()]
+
+
+def compare(
+    results: list[Result], baseline: list[Result], threshold: float
+) -> list[str]:
+    """Cases whose median got slower than baseline by more than threshold times, described."""
+    before = {(result["rows"], result["case"]): result["median"] for result in baseline}
+    regressions = []
+    for result in results:
+        old = before.get((result["rows"], result["case"]))
+        if old and result["median"] > old * threshold:
+            regressions.append(
+                f"{result['case']} at {result['rows']} rows: "
+                f"{old * 1000:.3f} ms -> {result['median'] * 1000:.3f} ms"
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description="Grocery list benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="File to write JSON results to, stdout if not given.",
+    )
+    parser.add_argument(
+        "--tk", action="store_true", help="Run GUI callbacks with real Tk widgets."
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="JSON results to check for regressions against."
+    )
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.sizes:
+        print(f"benchmarking {rows} rows", file=sys.stderr)
+        results += bench_size(rows, args.repeat, args.tk)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": SEED,
+            "tk": args.tk,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n")
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Collection, Iterable, Optional
+
+from groceries.item import ITEM_ENUMS, Item, Supply
+
+TO_BUY: tuple[Supply, ...] = (Supply.NEEDED, Supply.RUNNING_LOW)
+
+Cell = tuple[Enum, ...]
+
+
+@dataclass(frozen=True)
+class Totals:
+    """Number of items and sum of their prices."""
+
+    count: int = 0
+    total: float = 0.0
+
+
+@dataclass(frozen=True)
+class Summary:
+    """Totals of a set of items, of those of them to buy, and of each member of each enum field."""
+
+    items: Totals = Totals()
+    to_buy: Totals = Totals()
+    by_field: dict[str, dict[Enum, Totals]] = field(default_factory=dict)
+
+
+class Aggregates:
+    """Item count and price sum of each combination of enum members present, the cells of a small cube.
+
+    Each add, delete and update touches one or two cells, so keeping totals costs O(1) per change.
+    Summaries add up cells, bounded by the number of member combinations rather than items.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self.cells: dict[Cell, list] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Item) -> None:
+        """Count item and its price in its cell."""
+        self.add_cell(cell_of(item), 1, item.price)
+
+    def add_cell(self, cell: Cell, count: int, total: float) -> None:
+        """Add count items with prices summing to total to cell."""
+        totals = self.cells.setdefault(cell, [0, 0.0])
+        totals[0] += count
+        totals[1] += total
+
+    def delete(self, item: Item) -> None:
+        """Take item and its price out of its cell, dropping the cell once empty so no rounding error lingers."""
+        cell = cell_of(item)
+        totals = self.cells[cell]
+        totals[0] -= 1
+        if totals[0]:
+            totals[1] -= item.price
+        else:
+            del self.cells[cell]
+
+    def update(self, old_item: Item, item: Item) -> None:
+        """Move totals of old item over to item."""
+        self.delete(old_item)
+        self.add(item)
+
+    def summary(self, filters: dict[str, Optional[Collection[Enum]]]) -> Summary:
+        """Totals of cells matching filters keyed by item field, None meaning a field is not filtered."""
+        count, total = 0, 0.0
+        to_buy_count, to_buy_total = 0, 0.0
+        by_field = {
+            key: {member: [0, 0.0] for member in enum}
+            for key, enum in ITEM_ENUMS.items()
+        }
+        for cell, (cell_count, cell_total) in self.cells.items():
+            members = dict(zip(ITEM_ENUMS, cell))
+            if not all(
+                allowed is None or members[key] in allowed
+                for key, allowed in filters.items()
+            ):
+                continue
+            count += cell_count
+            total += cell_total
+            if members["supply"] in TO_BUY:
+                to_buy_count += cell_count
+                to_buy_total += cell_total
+            for key, member in members.items():
+                by_field[key][member][0] += cell_count
+                by_field[key][member][1] += cell_total
+        return Summary(
+            Totals(count, total),
+            Totals(to_buy_count, to_buy_total),
+            {
+                key: {member: Totals(*totals) for member, totals in members.items()}
+                for key, members in by_field.items()
+            },
+        )
+
+
+def cell_of(item: Item) -> Cell:
+    """Cell of item, its enum members in ITEM_ENUMS field order."""
+    return tuple(getattr(item, key) for key in ITEM_ENUMS)
@@ -0,0 +1,122 @@
+import sys
+from array import array
+from enum import Enum
+from typing import Any, Iterable, Iterator
+
+from groceries.item import ITEM_ENUMS, GrocerArea, Item, KitchenArea, Priority, Supply
+
+ENUM_MEMBERS: dict[str, list[Enum]] = {
+    key: list(enum) for key, enum in ITEM_ENUMS.items()
+}
+ENUM_CODES: dict[Enum, int] = {
+    member: code
+    for members in ENUM_MEMBERS.values()
+    for code, member in enumerate(members)
+}
+CODE_TYPE: str = "B"
+PRICE_TYPE: str = "d"
+
+
+class ItemColumns:
+    """Struct of arrays storage of items, one column per item field.
+
+    Enum fields are kept as byte codes of member position in its Enum, prices as doubles and names as given.
+    Rows are read back as ItemView objects standing in for items.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self.names: list[str] = []
+        self.prices = array(PRICE_TYPE)
+        self.codes: dict[str, array] = {key: array(CODE_TYPE) for key in ITEM_ENUMS}
+        self.extend(items)
+
+    def append(self, item: Item) -> None:
+        """Add item as a new row at end of columns."""
+        self.names.append(item.name)
+        self.prices.append(item.price)
+        for key, codes in self.codes.items():
+            codes.append(ENUM_CODES[getattr(item, key)])
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add items as new rows at end of columns."""
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, row: int) -> "ItemView":
+        if not -len(self) <= row < len(self):
+            raise IndexError(f"row {row} out of range for {len(self)} items.")
+        return ItemView(self, row % len(self))
+
+    def __iter__(self) -> Iterator["ItemView"]:
+        return (ItemView(self, row) for row in range(len(self)))
+
+    def nbytes(self) -> int:
+        """Bytes held by columns, counting name strings."""
+        return (
+            sys.getsizeof(self.names)
+            + sum(sys.getsizeof(name) for name in self.names)
+            + self.prices.itemsize * len(self.prices)
+            + sum(codes.itemsize * len(codes) for codes in self.codes.values())
+        )
+
+
+class ItemView:
+    """Read only view of a row of item columns, behaving as the Item in that row.
+
+    Fields are looked up from the columns on access, so holding a view costs no more than its slots.
+    """
+
+    __slots__ = ("columns", "row")
+
+    def __init__(self, columns: Any, row: int) -> None:
+        self.columns = columns
+        self.row = row
+
+    @property
+    def name(self) -> str:
+        return self.columns.names[self.row]
+
+    @property
+    def price(self) -> float:
+        return self.columns.prices[self.row]
+
+    @property
+    def priority(self) -> Priority:
+        return ENUM_MEMBERS["priority"][self.columns.codes["priority"][self.row]]
+
+    @property
+    def supply(self) -> Supply:
+        return ENUM_MEMBERS["supply"][self.columns.codes["supply"][self.row]]
+
+    @property
+    def grocer_area(self) -> GrocerArea:
+        code = self.columns.codes["grocer_area"][self.row]
+        return ENUM_MEMBERS["grocer_area"][code]
+
+    @property
+    def kitchen_area(self) -> KitchenArea:
+        code = self.columns.codes["kitchen_area"][self.row]
+        return ENUM_MEMBERS["kitchen_area"][code]
+
+    def to_item(self) -> Item:
+        """Copy row out as a standalone Item."""
+        return Item(
+            name=self.name,
+            price=self.price,
+            priority=self.priority,
+            supply=self.supply,
+            grocer_area=self.grocer_area,
+            kitchen_area=self.kitchen_area,
+        )
+
+    def __eq__(self, item: object) -> bool:
+        """View is the same as an item or view that contains the same name only."""
+        if not isinstance(item, (Item, ItemView)):
+            return NotImplemented
+        return self.name == item.name
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_item()!r})"
@@ -0,0 +1,136 @@
+from enum import Enum
+from itertools import compress
+from typing import Collection, Iterable, Optional
+
+from groceries.item import ITEM_ENUMS, Item
+
+COMPACT_MIN_SLOTS: int = 1024
+NAME_MASK_RATIO: int = 8
+FLAG_CHARS: bytes = bytes.maketrans(b"\x00\x01", b"01")
+CHAR_FLAGS: bytes = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class FilterIndex:
+    """Membership bitsets over item slots for every member of every item enum field.
+
+    Items get slots in add order and bit n of a member's bitset is set when the item in slot n has that member.
+    Deleted slots are left empty until they outnumber live items, then slots are compacted,
+    so slot order always matches add order.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()) -> None:
+        self.rebuild(items)
+
+    def rebuild(self, items: Iterable[Item]) -> None:
+        """Index items from scratch, building each bitset in one pass rather than bit by bit."""
+        self.slots: list[Optional[Item]] = list(items)
+        self.slot_of: dict[str, int] = {
+            item.name: slot for slot, item in enumerate(self.slots)
+        }
+        flags = {
+            member: bytearray(len(self.slots))
+            for enum in ITEM_ENUMS.values()
+            for member in enum
+        }
+        for slot, item in enumerate(self.slots):
+            for key in ITEM_ENUMS:
+                flags[getattr(item, key)][slot] = 1
+        self.bitsets: dict[Enum, int] = {
+            member: _flags_to_bits(flag) for member, flag in flags.items()
+        }
+        self.live = (1 << len(self.slots)) - 1
+
+    def add(self, item: Item) -> None:
+        """Put item in a new slot at the end, setting its bit for each of its members."""
+        slot = len(self.slots)
+        self.slots.append(item)
+        self.slot_of[item.name] = slot
+        bit = 1 << slot
+        for key in ITEM_ENUMS:
+            self.bitsets[getattr(item, key)] |= bit
+        self.live |= bit
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Put items in new slots at the end, their bits built in one pass then merged into each bitset once."""
+        start = len(self.slots)
+        self.slots += items
+        flags = {
+            member: bytearray(len(self.slots) - start)
+            for enum in ITEM_ENUMS.values()
+            for member in enum
+        }
+        for slot in range(start, len(self.slots)):
+            item = self.slots[slot]
+            self.slot_of[item.name] = slot
+            for key in ITEM_ENUMS:
+                flags[getattr(item, key)][slot - start] = 1
+        for member, flag in flags.items():
+            self.bitsets[member] |= _flags_to_bits(flag) << start
+        self.live |= ((1 << (len(self.slots) - start)) - 1) << start
+
+    def delete(self, item: Item) -> None:
+        """Empty item's slot and clear its bits, compacting slots when mostly empty."""
+        slot = self.slot_of.pop(item.name)
+        old_item = self.slots[slot]
+        self.slots[slot] = None
+        bit = 1 << slot
+        for key in ITEM_ENUMS:
+            self.bitsets[getattr(old_item, key)] ^= bit
+        self.live ^= bit
+        if len(self.slots) > COMPACT_MIN_SLOTS and len(self.slot_of) * 2 < len(
+            self.slots
+        ):
+            self.rebuild(item for item in self.slots if item is not None)
+
+    def update(self, item: Item) -> None:
+        """Swap in new item of same name, moving its bit only for members that changed."""
+        slot = self.slot_of[item.name]
+        old_item = self.slots[slot]
+        self.slots[slot] = item
+        bit = 1 << slot
+        for key in ITEM_ENUMS:
+            old_member, new_member = getattr(old_item, key), getattr(item, key)
+            if old_member is not new_member:
+                self.bitsets[old_member] ^= bit
+                self.bitsets[new_member] |= bit
+
+    def query(
+        self,
+        filters: dict[str, Optional[Collection[Enum]]],
+        names: Optional[Collection[str]] = None,
+    ) -> list[Item]:
+        """Items having one of the given members for every filtered field, in add order.
+
+        Filters map item field to allowed members, fields missing or mapped to None are not filtered.
+        If names given, only items of those names are kept, masked by slot when few names, else checked per item.
+        """
+        mask = self.live
+        if names is not None and len(names) * NAME_MASK_RATIO < len(self.slot_of):
+            flags = bytearray(len(self.slots))
+            for name in names:
+                flags[self.slot_of[name]] = 1
+            mask &= _flags_to_bits(flags)
+            names = None
+        for key, members in filters.items():
+            if members is None:
+                continue
+            allowed = 0
+            for member in members:
+                allowed |= self.bitsets[member]
+            mask &= allowed
+        items = compress(self.slots, _bits_to_flags(mask))
+        if names is not None:
+            return [item for item in items if item.name in names]
+        return list(items)
+
+
+def _flags_to_bits(flags: bytearray) -> int:
+    """Pack bytes of 0/1 flags, one per slot, into an int with bit n set for slot n."""
+    if not flags:
+        return 0
+    return int(flags[::-1].translate(FLAG_CHARS), 2)
+
+
+def _bits_to_flags(bits: int) -> bytes:
+    """Unpack int into bytes of 0/1 flags, one per slot up to its highest set bit."""
+    return bin(bits)[:1:-1].encode().translate(CHAR_FLAGS)
@@ -1,26 +1,323 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import replace as replace_fields
+from enum import Enum
 from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
 
+from groceries.aggregates import Aggregates, Summary
+from groceries.columnar import ItemView
+from groceries.constants import EMPTY
+from groceries.filter_index import FilterIndex
 from groceries.item import GrocerArea, Item, KitchenArea, Priority, Supply
+from groceries.query_cache import QUERY_CACHE_SIZE, QueryCache, query_key
+from groceries.search_index import FUZZY_LIMIT, SearchIndex
+from groceries.sort_index import (
+    ORDER_SORT_RATIO,
+    Order,
+    SortIndex,
+    sort_key,
+    sort_order,
+)
 
+if TYPE_CHECKING:
+    from groceries.journal import Journal
+
+PUT: str = "put"
+DELETE: str = "delete"
+ADD: str = "add"
+UPDATE: str = "update"
+
+
+class DuplicateItemError(ValueError):
+    """Raised when adding an item whose name is already on the grocery list."""
+
+
+@dataclass(frozen=True)
+class Change:
+    """Change made to a grocery list, op being ADD, DELETE or UPDATE.
+
+    Item is the item added, deleted or updated to, old the item an update replaced.
+    """
+
+    op: str
+    item: Item
+    old: Optional[Item] = None
+
+
+@dataclass(frozen=True)
+class Batch:
+    """Changes made together by one apply_batch, told to observers at once."""
+
+    changes: tuple[Change, ...]
+
+
+Observer = Callable[[Union[Change, Batch]], None]
+
+
+class BaseGroceryList(ABC):
+    """Grocery list interface shared by storage backends, so the GUI runs against any of them.
+
+    Items are kept in insertion order and keyed by name, items being equal by name only.
+    Observers subscribed to the list are called with a Change after each add, delete and update,
+    or once with a Batch of all the changes apply_batch made.
+    Each change also bumps the list's generation, query results being cached until the generation moves on.
+    """
 
-@dataclass
-class GroceryList:
-    item_list: list[Item]
     outpath: Path
 
+    def __init__(self, cache_size: int = QUERY_CACHE_SIZE) -> None:
+        self.observers: list[Observer] = []
+        self.batch: Optional[list[Change]] = None
+        self.generation = 0
+        self.query_cache = QueryCache(cache_size)
+
+    def subscribe(self, observer: Observer) -> Callable[[], None]:
+        """Call observer with each change from now on, returning a function that unsubscribes it."""
+        self.observers.append(observer)
+        return lambda: self.observers.remove(observer)
+
+    def _notify(self, op: str, item: Item, old: Optional[Item] = None) -> None:
+        """Bump generation for a change and tell observers of it, nothing built if there are none.
+
+        While a batch is applied the change is held back in it instead.
+        """
+        self.generation += 1
+        if self.batch is not None:
+            self.batch.append(Change(op, item, old))
+        elif self.observers:
+            self._tell(Change(op, item, old))
+
+    def _tell(self, event: Union[Change, Batch]) -> None:
+        """Call each observer with event."""
+        for observer in list(self.observers):
+            observer(event)
+
+    def apply_batch(self, ops: Iterable[tuple[str, Item]]) -> list[Change]:
+        """Apply many (op, item) mutations in one pass, returning the changes they made.
+
+        Op PUT updates item in place or adds it, DELETE deletes it. Observers are told once, with a Batch
+        of every change, even if a mutation raises part way.
+        """
+        with self._batched() as changes:
+            self._apply_batch(ops)
+        return changes
+
+    @contextmanager
+    def _batched(self) -> Iterator[list[Change]]:
+        """Hold back changes made within in a batch, telling observers of them once as a Batch on leaving.
+
+        Raises RuntimeError if a batch is already open.
+        """
+        if self.batch is not None:
+            raise RuntimeError("A batch is already being applied.")
+        self.batch = []
+        try:
+            yield self.batch
+        finally:
+            changes, self.batch = self.batch, None
+            if changes and self.observers:
+                self._tell(Batch(tuple(changes)))
+
+    def _apply_batch(self, ops: Iterable[tuple[str, Item]]) -> None:
+        """Apply mutations one by one, changes collected by _notify into the open batch."""
+        for op, item in ops:
+            if op == DELETE:
+                self.delete(item)
+            else:
+                self.update(item)
+
+    def set_where(
+        self, predicate: Callable[[Item], bool], **fields: Any
+    ) -> list[Change]:
+        """Set given fields on every item predicate accepts, in one batch, returning the changes made.
+
+        E.g. set_where(lambda item: item.supply is Supply.NEEDED, supply=Supply.SUPPLIED) after a shopping trip.
+        """
+        return self.set_fields([item for item in self if predicate(item)], **fields)
+
+    def set_fields(self, items: Iterable[Item], **fields: Any) -> list[Change]:
+        """Set given fields on each of items, in one batch, returning the changes made.
+
+        Items may be views of snapshot rows, copied out as Items to set fields on.
+        """
+        return self.apply_batch(
+            [
+                (
+                    PUT,
+                    replace_fields(
+                        item.to_item() if isinstance(item, ItemView) else item,
+                        **fields,
+                    ),
+                )
+                for item in items
+            ]
+        )
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Item]:
+        """Iterate items in list order."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of items on grocery list."""
+
+    @abstractmethod
+    def get(self, name: str) -> Optional[Item]:
+        """Get item of given name, None if not on grocery list."""
+
+    @abstractmethod
     def add(self, item: Item) -> None:
-        """Add item to grocery list."""
-        self.item_list.append(item)
+        """Add item to grocery list, raising DuplicateItemError if an item of same name exists."""
 
+    @abstractmethod
     def delete(self, item: Item) -> None:
-        """Remove item from grocery list."""
-        self.item_list = [new_item for new_item in self.item_list if new_item != item]
+        """Remove item from grocery list, nothing done if not on list."""
 
+    @abstractmethod
     def update(self, item: Item) -> None:
-        """Update item on grocery list by deleting item of same name, then adding it."""
-        self.delete(item)
-        self.add(item)
+        """Update item on grocery list by replacing item of same name in place, adding it if not on list."""
+
+    def ingest(self, batches: Iterable[list[Item]]) -> int:
+        """Add batches of items as streamed from stream_items_from_csv, returning number of items ingested.
+
+        Items already on the list, by name, are updated in place. Observers are told once, with a Batch of
+        every change, once all batches are in or one raises. Changes are only held for a Batch while observers
+        are subscribed, so an ingest nothing observes stays bounded in memory.
+        """
+        if not self.observers:
+            return self._ingest(batches)
+        with self._batched():
+            return self._ingest(batches)
+
+    def _ingest(self, batches: Iterable[list[Item]]) -> int:
+        """Update item by item, returning number of items ingested."""
+        ingested = 0
+        for batch in batches:
+            for item in batch:
+                self.update(item)
+            ingested += len(batch)
+        return ingested
+
+    def query(
+        self,
+        priorities: Optional[Collection[Priority]] = None,
+        supplies: Optional[Collection[Supply]] = None,
+        kitchen: Optional[Collection[KitchenArea]] = None,
+        grocer: Optional[Collection[GrocerArea]] = None,
+        search: str = EMPTY,
+        order: Optional[Sequence[str]] = None,
+    ) -> list[Item]:
+        """Items matching all given filters and with names containing search term, in list order or sorted.
+
+        Each filter is a collection of allowed members, None meaning that field is not filtered.
+        An empty search term does not narrow items.
+        Order is item fields to sort by in turn, e.g. ("grocer_area", "name"), ties broken by name,
+        enum fields sorting by member order. None keeps list order.
+        Results are cached by filter sets, search term and order until the next change,
+        a fresh list returned each time.
+        """
+        filters = filter_fields(priorities, supplies, kitchen, grocer)
+        order = sort_order(order)
+        key = query_key(filters, search, order)
+        result = self.query_cache.get(key, self.generation)
+        if result is None:
+            result = self._query(filters, search, order)
+            self.query_cache.put(key, self.generation, result)
+        return list(result)
+
+    @abstractmethod
+    def _query(
+        self,
+        filters: dict[str, Optional[Collection[Enum]]],
+        search: str,
+        order: Optional[Order] = None,
+    ) -> list[Item]:
+        """Uncached query, filters keyed by item field as filter_fields gives them, order as sort_order gives it."""
+
+    @abstractmethod
+    def fuzzy_search(
+        self,
+        term: str,
+        limit: int = FUZZY_LIMIT,
+        priorities: Optional[Collection[Priority]] = None,
+        supplies: Optional[Collection[Supply]] = None,
+        kitchen: Optional[Collection[KitchenArea]] = None,
+        grocer: Optional[Collection[GrocerArea]] = None,
+    ) -> list[Item]:
+        """Items with names closest to possibly misspelled search term, best match first, at most limit of them.
+
+        Filters are as in query.
+        """
+
+    def summary(
+        self,
+        priorities: Optional[Collection[Priority]] = None,
+        supplies: Optional[Collection[Supply]] = None,
+        kitchen: Optional[Collection[KitchenArea]] = None,
+        grocer: Optional[Collection[GrocerArea]] = None,
+    ) -> Summary:
+        """Count and price total of items matching filters, of those needed or running low,
+        and of each priority, supply, kitchen area and grocer area among them.
+
+        Filters are as in query.
+        """
+        filters = filter_fields(priorities, supplies, kitchen, grocer)
+        return self._aggregates(filters).summary(filters)
+
+    @abstractmethod
+    def _aggregates(self, filters: dict[str, Optional[Collection[Enum]]]) -> Aggregates:
+        """Aggregates covering at least the items matching filters."""
+
+    @property
+    def item_list(self) -> list[Item]:
+        """Items on grocery list in insertion order."""
+        return list(self)
+
+    def __contains__(self, item: Union[Item, str]) -> bool:
+        """Check item, or item name, is on grocery list."""
+        return self.get(item if isinstance(item, str) else item.name) is not None
+
+    def replace(self, old_item: Item, new_item: Item) -> None:
+        """Replace old item with new item, which may have been renamed.
+
+        A rename deletes old item and adds new item in one batch. A rename onto the name of another item
+        raises DuplicateItemError, leaving list unchanged.
+        """
+        if new_item.name == old_item.name:
+            self.update(new_item)
+            return
+        if new_item in self:
+            raise DuplicateItemError(
+                f"{new_item.name!r} is already on the grocery list."
+            )
+        self.apply_batch([(DELETE, old_item), (PUT, new_item)])
+
+    def search(self, term: str) -> list[Item]:
+        """Items with names containing search term, in list order."""
+        return self.query(search=term)
+
+    def close(self) -> None:
+        """Release anything backing grocery list, nothing to release by default."""
+
+    def writing(self, path: Path) -> bool:
+        """Check grocery list is itself writing file at path in the background, never by default."""
+        return False
+
+    def written(self, path: Path) -> Optional[tuple[int, int]]:
+        """Modification time and size file at path had when grocery list itself last wrote it, None if it has not."""
+        return None
 
     def filter_priorities(
         self, item_list: list[Item], filters: list[Priority]
@@ -45,3 +342,212 @@ class GroceryList:
     ) -> list[Item]:
         """Filter grocery list by only includign items with given grocer area(s)"""
         return [item for item in item_list if item.grocer_area in filters]
+
+
+class GroceryList(BaseGroceryList):
+    """Grocery items held in memory, indexed by name, by filter bitsets and by trigrams for search.
+
+    Each sort order asked for is built once, then kept sorted through every add, delete and update.
+    Count and price totals by enum members are kept up to date the same way.
+    If given a journal, every add, delete and update is appended to it.
+    Items loaded under a name already loaded replace the earlier item in its place, as a csv repeating a name is read.
+    """
+
+    def __init__(
+        self,
+        item_list: Iterable[Item],
+        outpath: Path,
+        journal: Optional["Journal"] = None,
+        cache_size: int = QUERY_CACHE_SIZE,
+    ) -> None:
+        super().__init__(cache_size)
+        self.outpath = outpath
+        self.journal = journal
+        self.items: dict[str, Item] = {item.name: item for item in item_list}
+        self.filters = FilterIndex(self.items.values())
+        self.search_index = SearchIndex(self.items)
+        self.sort_indexes: dict[Order, SortIndex] = {}
+        self.aggregates = Aggregates(self.items.values())
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self.items.values())
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, name: str) -> Optional[Item]:
+        return self.items.get(name)
+
+    def add(self, item: Item) -> None:
+        if item.name in self.items:
+            raise DuplicateItemError(f"{item.name!r} is already on the grocery list.")
+        self.items[item.name] = item
+        self.filters.add(item)
+        self.search_index.add(item.name)
+        for sort_index in self.sort_indexes.values():
+            sort_index.add(item)
+        self.aggregates.add(item)
+        self._log(PUT, item)
+        self._notify(ADD, item)
+
+    def _ingest(self, batches: Iterable[list[Item]]) -> int:
+        """Add batches of items, returning number of items ingested.
+
+        Items already on the list, by name, are updated in place. New items of each batch are indexed together,
+        later items of a batch replacing earlier ones of same name. New items are not journaled one by one,
+        a journal instead compacted into a fresh snapshot once all batches are in.
+        """
+        ingested = 0
+        added = False
+        for batch in batches:
+            new_items: dict[str, Item] = {}
+            for item in batch:
+                if item.name in self.items:
+                    self.update(item)
+                else:
+                    new_items[item.name] = item
+            self._extend(list(new_items.values()))
+            added = added or bool(new_items)
+            ingested += len(batch)
+        if self.journal is not None and added:
+            self.journal.compact(self.item_list)
+        return ingested
+
+    def _extend(self, items: list[Item]) -> None:
+        """Add items not on list, updating each index once for all of them rather than item by item."""
+        for item in items:
+            self.items[item.name] = item
+            self.search_index.add(item.name)
+            self.aggregates.add(item)
+        self.filters.extend(items)
+        for sort_index in self.sort_indexes.values():
+            sort_index.extend(items)
+        for item in items:
+            self._notify(ADD, item)
+
+    def delete(self, item: Item) -> None:
+        old_item = self.items.pop(item.name, None)
+        if old_item is not None:
+            self.filters.delete(item)
+            self.search_index.delete(item.name)
+            for sort_index in self.sort_indexes.values():
+                sort_index.delete(old_item)
+            self.aggregates.delete(old_item)
+            self._log(DELETE, item)
+            self._notify(DELETE, old_item)
+
+    def update(self, item: Item) -> None:
+        if item.name not in self.items:
+            self.add(item)
+            return
+        old_item = self.items[item.name]
+        self.items[item.name] = item
+        self.filters.update(item)
+        for sort_index in self.sort_indexes.values():
+            sort_index.update(old_item, item)
+        self.aggregates.update(old_item, item)
+        self._log(PUT, item)
+        self._notify(UPDATE, item, old_item)
+
+    def close(self) -> None:
+        """Close journal if any."""
+        if self.journal is not None:
+            self.journal.close()
+
+    def writing(self, path: Path) -> bool:
+        """Check journal is compacting into snapshot at path."""
+        return (
+            self.journal is not None
+            and self.journal.snapshot == Path(path)
+            and self.journal.compacting()
+        )
+
+    def written(self, path: Path) -> Optional[tuple[int, int]]:
+        """Modification time and size of snapshot at path as journal compaction last wrote it."""
+        if self.journal is None or self.journal.snapshot != Path(path):
+            return None
+        return self.journal.written
+
+    def _log(self, op: str, item: Item) -> None:
+        """Append mutation to journal if any, folding journal into a snapshot once it grows long enough."""
+        if self.journal is None:
+            return
+        self.journal.record(op, item)
+        if self.journal.needs_compaction():
+            self.journal.compact(self.item_list)
+
+    def _query(
+        self,
+        filters: dict[str, Optional[Collection[Enum]]],
+        search: str,
+        order: Optional[Order] = None,
+    ) -> list[Item]:
+        """Filters and search answered in one pass over the filter bitsets, search term narrowed by the search index.
+
+        Sorted results are read off the order's sort index, or sorted directly when
+        they are few enough that sorting them beats walking the whole order.
+        """
+        result = self.filters.query(
+            filters, names=self.search_index.search(search) if search else None
+        )
+        if order is None:
+            return result
+        if len(result) * ORDER_SORT_RATIO < len(self.items):
+            return sorted(result, key=lambda item: sort_key(item, order))
+        names = self.sort_index(order).names()
+        if len(result) == len(self.items):
+            return [self.items[name] for name in names]
+        wanted = {item.name for item in result}
+        return [self.items[name] for name in names if name in wanted]
+
+    def sort_index(self, order: Order) -> SortIndex:
+        """Sort index of order, built on first use and maintained from then on."""
+        if order not in self.sort_indexes:
+            self.sort_indexes[order] = SortIndex(order, self.items.values())
+        return self.sort_indexes[order]
+
+    def _aggregates(self, filters: dict[str, Optional[Collection[Enum]]]) -> Aggregates:
+        """Aggregates of every item, kept up to date on each change."""
+        return self.aggregates
+
+    def fuzzy_search(
+        self,
+        term: str,
+        limit: int = FUZZY_LIMIT,
+        priorities: Optional[Collection[Priority]] = None,
+        supplies: Optional[Collection[Supply]] = None,
+        kitchen: Optional[Collection[KitchenArea]] = None,
+        grocer: Optional[Collection[GrocerArea]] = None,
+    ) -> list[Item]:
+        """Filters are checked on each fuzzy candidate from the search index before it is scored."""
+        filters = filter_fields(priorities, supplies, kitchen, grocer)
+
+        def accept(name: str) -> bool:
+            return matches_filters(self.items[name], filters)
+
+        return [
+            self.items[name] for name in self.search_index.fuzzy(term, limit, accept)
+        ]
+
+
+def filter_fields(
+    priorities: Optional[Collection[Priority]] = None,
+    supplies: Optional[Collection[Supply]] = None,
+    kitchen: Optional[Collection[KitchenArea]] = None,
+    grocer: Optional[Collection[GrocerArea]] = None,
+) -> dict[str, Optional[Collection[Enum]]]:
+    """Map query filters to the item fields they filter."""
+    return {
+        "priority": priorities,
+        "supply": supplies,
+        "kitchen_area": kitchen,
+        "grocer_area": grocer,
+    }
+
+
+def matches_filters(item: Item, filters: dict[str, Optional[Collection[Enum]]]) -> bool:
+    """Check item has one of the members of each field filter_fields filters on."""
+    return all(
+        members is None or getattr(item, key) in members
+        for key, members in filters.items()
+    )
@@ -1,11 +1,33 @@
+import math
 import tkinter as tk
 import tkinter.font as tkf
+from bisect import bisect_left, insort
+from enum import Enum
 from functools import partial
+from pathlib import Path
+from tkinter import messagebox, ttk
+from typing import Any, Callable, Optional, Union
 
+from groceries.aggregates import Summary, Totals
 from groceries.constants import EMPTY
-from groceries.grocer_list import GroceryList
-from groceries.io import items_to_csv
+from groceries.grocer_list import (
+    ADD,
+    DELETE,
+    UPDATE,
+    BaseGroceryList,
+    Batch,
+    Change,
+    DuplicateItemError,
+    filter_fields,
+    matches_filters,
+)
+from groceries.history import HISTORY_DEPTH, History
+from groceries.io import ItemParseError, Progress, items_to_csv_chunked
 from groceries.item import GrocerArea, Item, KitchenArea, Priority, Supply
+from groceries.profiler import Profiler
+from groceries.sort_index import Order, sort_key, sort_order
+from groceries.watcher import CsvWatcher
+from groceries.worker import DONE, FAILED, PROGRESS, BackgroundTask
 
 NAME_TEXT: str = "Name"
 PRICE_TEXT: str = "Price"
@@ -40,21 +62,136 @@ MENU_BUTTON_FONT: int = 40
 DONE_BUTTON_PROMPT: str = "Add Item"
 DELETE_BUTTON_PROMPT: str = "Delete Item"
 BACK_BUTTON_PROMPT: str = "Back"
+NAME_REQUIRED: str = "Name is required."
+PRICE_INVALID: str = "Price must be a number, 0 or more."
+ERROR_COLOUR: str = "red"
+SELECTED_COLOUR: str = "light blue"
 
 FILTER_BUTTON_WIDTH: int = 20
 FILTER_BUTTON_HEIGHT: int = 2
 FILTER_BUTTON_FONT: int = 20
+FUZZY_PROMPT: str = "Fuzzy Match"
+SORT_PROMPT: str = "Sort By"
+ADDED_TEXT: str = "Added"
+STORE_WALK_TEXT: str = "Store Walk"
+SORT_ORDERS: dict[str, tuple[str, ...]] = {
+    ADDED_TEXT: (),
+    NAME_TEXT: ("name",),
+    PRICE_TEXT: ("price",),
+    PRIORITY_TEXT: ("priority",),
+    SUPPLY_TEXT: ("supply",),
+    GROCER_TEXT: ("grocer_area",),
+    KITCHEN_TEXT: ("kitchen_area",),
+    STORE_WALK_TEXT: ("grocer_area", "kitchen_area"),
+}
+FIELD_TEXTS: dict[str, str] = {
+    "priority": PRIORITY_TEXT,
+    "supply": SUPPLY_TEXT,
+    "grocer_area": GROCER_TEXT,
+    "kitchen_area": KITCHEN_TEXT,
+}
+SUMMARY_LABEL: str = "Totals"
+ALL_ITEMS_TEXT: str = "All Items"
+TO_BUY_TEXT: str = "To Buy"
+SUMMARY_FONT: str = "TkFixedFont"
+SELECT_PROMPT: str = "Select Items"
+KEEP_TEXT: str = "Keep"
+SET_SELECTED_PROMPT: str = "Set Selected"
+BATCH_PATCH_LIMIT: int = 32
 APPLY_BUTTON_PROMPT: str = "Apply Filters"
 CLEAR_BUTTON_PROMPT: str = "Clear Filters"
 
+SEARCH_DEBOUNCE_MS: int = 200
+
+TASK_POLL_MS: int = 50
+PROGRESS_LENGTH_PX: int = 300
+IMPORT_STATUS: str = "Loading items..."
+EXPORT_STATUS: str = "Exporting to CSV..."
+CANCEL_BUTTON_PROMPT: str = "Cancel"
+
+PROFILED_CALLBACKS: tuple[str, ...] = (
+    "_apply_filters",
+    "_sort_chosen",
+    "_make_list",
+    "_refresh_summary",
+    "_set_selected",
+    "_poll_watch",
+    "_undo",
+    "_redo",
+    "go_home",
+    "go_menu",
+    "_update_done",
+    "_delete_done",
+    "scroll_canvas",
+    "_scroll_list",
+)
+PROFILED_GROCERY_OPS: tuple[str, ...] = (
+    "add",
+    "delete",
+    "update",
+    "replace",
+    "query",
+    "fuzzy_search",
+    "summary",
+)
+WATCH_POLL_MS: int = 1000
+UNDO_KEYS: tuple[str, ...] = ("<Control-z>", "<Control-Z>")
+REDO_KEYS: tuple[str, ...] = ("<Control-y>", "<Control-Y>")
+PROFILE_REFRESH_MS: int = 1000
+PROFILE_DUMP_MS: int = 10_000
+DEBUG_FONT: str = "TkFixedFont"
+
 
 class GUI(tk.Tk):
-    def __init__(self, grocery: GroceryList) -> None:
+    def __init__(
+        self,
+        grocery: BaseGroceryList,
+        profiler: Optional[Profiler] = None,
+        profile_path: Optional[Path] = None,
+        watch: Optional[Path] = None,
+        history_depth: int = HISTORY_DEPTH,
+    ) -> None:
+        """Make window over grocery list.
+
+        If profiler given, GUI callbacks and grocery list operations are timed into it and shown in a debug panel,
+        along with widget create and destroy counts, its report also dumped as JSON to profile_path if given.
+        If watch given, that csv is polled every WATCH_POLL_MS and edits other programs make to it applied to the list.
+        The last history_depth changes to the list can be undone with Ctrl+Z and redone with Ctrl+Y.
+        """
         super().__init__()
         self.grocery = grocery
+        self.profiler = profiler
+        self.profile_path = profile_path
+        if profiler is not None:
+            profiler.instrument(self, PROFILED_CALLBACKS)
+            profiler.instrument(grocery, PROFILED_GROCERY_OPS, prefix="grocery.")
+        self.unsubscribe = grocery.subscribe(self._grocery_changed)
+        self.history_depth = history_depth
+        self.history = History(grocery, history_depth)
         self.list_items: list[tk.Button] = []
-        self.filter_list: list[Item] = [item for item in self.grocery.item_list]
+        self.list_windows: list[int] = []
+        self.drawn_rows: list[Optional[tuple[int, Item, bool]]] = []
+        self.show_list: list[Item] = []
+        self.shown_search: str = EMPTY
+        self.shown_fuzzy: bool = False
+        self.shown_order: Optional[Order] = None
+        self.list_dirty: bool = False
+        self.redraw_job: Optional[str] = None
+        self.summary_text = tk.StringVar()
+        self.summary_job: Optional[str] = None
+        self.applied_filters: dict[str, list[Enum]] = {}
         self.search_term = tk.StringVar()
+        self.search_term.trace_add("write", self._search_typed)
+        self.search_job: Optional[str] = None
+        self.fuzzy = tk.IntVar()
+        self.sort_by = tk.StringVar(value=ADDED_TEXT)
+        self.select_mode = tk.IntVar()
+        self.selected: set[str] = set()
+        self.selection_text = tk.StringVar(value=selection_text(0))
+        self.bulk_supply = tk.StringVar(value=KEEP_TEXT)
+        self.bulk_priority = tk.StringVar(value=KEEP_TEXT)
+        self.task: Optional[BackgroundTask] = None
+        self.task_status = tk.StringVar()
 
         # TK Entry Values
         self.itemname = tk.StringVar()
@@ -69,9 +206,23 @@ class GUI(tk.Tk):
         self.filtersupply = {mem: tk.IntVar() for mem in Supply}
         self.filterkitchen = {mem: tk.IntVar() for mem in KitchenArea}
         self.filtergrocer = {mem: tk.IntVar() for mem in GrocerArea}
+        self.item_error = tk.StringVar()
+
+        # Fonts shared by every widget of the same font size.
+        self.fonts: dict[int, tkf.Font] = {}
 
         self.make_gui()
 
+        self.watcher: Optional[CsvWatcher] = None
+        if watch is not None:
+            self.watcher = CsvWatcher(watch)
+            self.after(WATCH_POLL_MS, self._poll_watch)
+
+        for key in UNDO_KEYS:
+            self.bind_all(key, self._undo)
+        for key in REDO_KEYS:
+            self.bind_all(key, self._redo)
+
     def make_gui(self) -> None:
         """Constructor does Tkinter initialization then sets up GUI components.
         Starts with main window of given size. Main frame contains grocery list, add button, filters subframes.
@@ -86,9 +237,9 @@ class GUI(tk.Tk):
         self.current_frame: tk.Frame = self.main_frame
         self.main_frame.pack()
 
-        # Item Add/Update Menu
+        # Item Add/Update Menu, built once and filled in for each item opened.
         self.menu_grid_frame = tk.Frame(self)
-        self._make_menu(Item())
+        self._make_menu()
 
         # Add Button SubFrame for new entries.
         self.button_frame = tk.Frame(self.main_frame)
@@ -97,21 +248,24 @@ class GUI(tk.Tk):
         # List SubFrame
         self.list_frame = tk.Frame(self.main_frame, height=HEIGHT_PX, width=WIDTH_LIST)
         self.item_label = tk.Label(
-            self.list_frame, text="Items", font=tkf.Font(size=MAIN_LABEL_FONT)
+            self.list_frame, text="Items", font=self._font(MAIN_LABEL_FONT)
         )
         self.canvas = tk.Canvas(self.list_frame)
-        self.list_subframe = tk.Frame(self.canvas)
         self.scrollbar = tk.Scrollbar(
-            self.list_frame, orient=tk.VERTICAL, command=self.canvas.yview
+            self.list_frame, orient=tk.VERTICAL, command=self._scroll_list
         )
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         self.item_label.pack(side=tk.TOP)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.canvas.pack(side=tk.LEFT)
-        self.canvas.create_window(0.0, 0.0, window=self.list_subframe)
-        self.list_subframe.bind("<Configure>", self.scroll_canvas)
+        self._make_list_pool()
+        self.canvas.bind("<Configure>", self.scroll_canvas)
         self._make_list()
 
+        # Background Task SubFrame, shown while a task runs.
+        self.task_frame = tk.Frame(self.main_frame)
+        self._make_task_bar()
+
         # Filter SubFrame
         self.filter_frame = tk.Frame(self.main_frame)
         self.filter_button_frame = tk.Frame(self.main_frame)
@@ -119,34 +273,100 @@ class GUI(tk.Tk):
         self._make_filter_checkboxes()
         self._make_filter_buttons()
 
+        # Summary SubFrame, totals of filtered items.
+        self.summary_frame = tk.Frame(self.main_frame)
+        self._make_summary()
+
         self.button_frame.grid(row=0, column=0, rowspan=2, columnspan=2)
         self.list_frame.grid(row=0, column=2, rowspan=2, columnspan=5)
         self.filter_frame.grid(row=0, column=7, rowspan=1, columnspan=3)
         self.filter_button_frame.grid(row=1, column=7, rowspan=1, columnspan=3)
+        self.summary_frame.grid(row=2, column=7, rowspan=1, columnspan=3)
+        self.task_frame.grid(row=2, column=0, rowspan=1, columnspan=2)
+        self.task_frame.grid_remove()
+        self.protocol("WM_DELETE_WINDOW", self._close)
+
+        # Debug Panel, only when profiling.
+        if self.profiler is not None:
+            self._make_debug_panel()
+
+    def _font(self, size: int) -> tkf.Font:
+        """Font of given size, made on first use then shared by every widget asking for that size."""
+        if size not in self.fonts:
+            self.fonts[size] = tkf.Font(size=size)
+        return self.fonts[size]
 
     def scroll_canvas(self, _) -> None:
-        """Function called to move canvas when scrolling to change view."""
+        """Function called to move canvas when scrolling to change view.
+
+        Scroll region spans every row of the list, not just the pooled buttons, then visible rows redrawn.
+        """
         self.canvas.configure(
-            scrollregion=self.canvas.bbox(tk.ALL),
+            scrollregion=(0, 0, WIDTH_LIST, len(self.show_list) * self.row_height),
             width=WIDTH_LIST,
             height=HEIGHT_PX,
         )
+        self._draw_rows()
+
+    def _scroll_list(self, *args: str) -> None:
+        """Scrollbar callback, scroll canvas then rebind pooled buttons to rows now in view."""
+        self.canvas.yview(*args)
+        self._draw_rows()
+
+    def _make_list_pool(self) -> None:
+        """Make fixed pool of list buttons, enough to fill canvas viewport, sharing one font.
+
+        First button sizes the rows, each button sits in a canvas window moved to the row it shows.
+        """
+        self.list_font = self._font(LIST_ENTRY_FONT)
+        self.list_items = [self._make_list_button()]
+        self.row_height = self.list_items[0].winfo_reqheight()
+        self.list_bg = self.list_items[0].cget("background")
+        self.list_items += [
+            self._make_list_button() for _ in range(HEIGHT_PX // self.row_height + 1)
+        ]
+        self.list_windows = [
+            self.canvas.create_window(0, 0, window=btn, anchor=tk.NW, state=tk.HIDDEN)
+            for btn in self.list_items
+        ]
+        self.drawn_rows = [None] * len(self.list_items)
+        self.canvas.configure(yscrollincrement=self.row_height)
+
+    def _make_list_button(self) -> tk.Button:
+        """Make a pooled list button, text and command bound when drawn."""
+        return tk.Button(
+            self.canvas,
+            width=LIST_ENTRY_WIDTH,
+            height=LIST_ENTRY_HEIGHT,
+            font=self.list_font,
+        )
 
     def _make_buttons(self) -> None:
-        """Make add item and export buttons."""
-        for widget in self.button_frame.winfo_children():
-            widget.destroy()
+        """Make search box, sort choice, add item, export and bulk edit buttons, built once."""
         self.search_label = tk.Label(
             self.button_frame,
             text="Search By Name",
-            font=tkf.Font(size=MAIN_LABEL_FONT),
+            font=self._font(MAIN_LABEL_FONT),
         )
         self.search_box = tk.Entry(self.button_frame, textvariable=self.search_term)
+        self.fuzzy_box = tk.Checkbutton(
+            self.button_frame,
+            text=FUZZY_PROMPT,
+            variable=self.fuzzy,
+            font=self._font(OPTION_LABEL_FONT),
+            command=self._make_list,
+        )
+        self.sort_label = tk.Label(
+            self.button_frame, text=SORT_PROMPT, font=self._font(OPTION_LABEL_FONT)
+        )
+        self.sort_dropdown = tk.OptionMenu(
+            self.button_frame, self.sort_by, *SORT_ORDERS, command=self._sort_chosen
+        )
         self.search_button = tk.Button(
             self.button_frame,
             width=MAIN_BUTTON_WIDTH,
             height=MAIN_BUTTON_HEIGHT,
-            font=tkf.Font(size=MAIN_BUTTON_FONT),
+            font=self._font(MAIN_BUTTON_FONT),
             text="Search",
             command=self._make_list,
         )
@@ -154,7 +374,7 @@ class GUI(tk.Tk):
             self.button_frame,
             width=MAIN_BUTTON_WIDTH,
             height=MAIN_BUTTON_HEIGHT,
-            font=tkf.Font(size=MAIN_BUTTON_FONT),
+            font=self._font(MAIN_BUTTON_FONT),
             text=ADD_BUTTON_PROMPT,
             command=self._add,
         )
@@ -162,101 +382,318 @@ class GUI(tk.Tk):
             self.button_frame,
             width=MAIN_BUTTON_WIDTH,
             height=MAIN_BUTTON_HEIGHT,
-            font=tkf.Font(size=MAIN_BUTTON_FONT),
+            font=self._font(MAIN_BUTTON_FONT),
             text=EXPORT_BUTTON_PROMPT,
-            command=lambda: items_to_csv(self.grocery.item_list, self.grocery.outpath),
+            command=self._export,
         )
         self.search_label.pack(side=tk.TOP)
         self.search_box.pack(side=tk.TOP)
+        self.fuzzy_box.pack(side=tk.TOP)
+        self.sort_label.pack(side=tk.TOP)
+        self.sort_dropdown.pack(side=tk.TOP)
         self.search_button.pack(side=tk.TOP)
         self.add_button.pack(side=tk.TOP)
         self.export_button.pack(side=tk.TOP)
+        self._make_bulk_edit()
+
+    def _make_bulk_edit(self) -> None:
+        """Make select mode toggle, selection count, and supply and priority choices set on all selected items."""
+        self.select_box = tk.Checkbutton(
+            self.button_frame,
+            text=SELECT_PROMPT,
+            variable=self.select_mode,
+            font=self._font(OPTION_LABEL_FONT),
+            command=self._select_mode_changed,
+        )
+        self.selection_label = tk.Label(
+            self.button_frame,
+            textvariable=self.selection_text,
+            font=self._font(OPTION_LABEL_FONT),
+        )
+        self.bulk_supply_dropdown = tk.OptionMenu(
+            self.button_frame,
+            self.bulk_supply,
+            KEEP_TEXT,
+            *[opt.value for opt in Supply],
+        )
+        self.bulk_priority_dropdown = tk.OptionMenu(
+            self.button_frame,
+            self.bulk_priority,
+            KEEP_TEXT,
+            *[opt.value for opt in Priority],
+        )
+        self.set_selected_button = tk.Button(
+            self.button_frame,
+            font=self._font(OPTION_LABEL_FONT),
+            text=SET_SELECTED_PROMPT,
+            command=self._set_selected,
+        )
+        self.select_box.pack(side=tk.TOP)
+        self.selection_label.pack(side=tk.TOP)
+        self.bulk_supply_dropdown.pack(side=tk.TOP)
+        self.bulk_priority_dropdown.pack(side=tk.TOP)
+        self.set_selected_button.pack(side=tk.TOP)
+
+    def _make_task_bar(self) -> None:
+        """Make status label, progress bar and cancel button for background tasks, hidden until a task runs."""
+        self.task_label = tk.Label(
+            self.task_frame,
+            textvariable=self.task_status,
+            font=self._font(OPTION_LABEL_FONT),
+        )
+        self.progress_bar = ttk.Progressbar(
+            self.task_frame, orient=tk.HORIZONTAL, length=PROGRESS_LENGTH_PX
+        )
+        self.cancel_button = tk.Button(
+            self.task_frame,
+            text=CANCEL_BUTTON_PROMPT,
+            font=self._font(OPTION_LABEL_FONT),
+            command=self._cancel_task,
+        )
+        self.task_label.pack(side=tk.TOP)
+        self.progress_bar.pack(side=tk.TOP)
+        self.cancel_button.pack(side=tk.TOP)
+
+    def _make_debug_panel(self) -> None:
+        """Make panel along bottom of window showing profiler summary, refreshed every PROFILE_REFRESH_MS.
+
+        Widgets destroyed are counted from Destroy events of every widget, widgets created as those destroyed plus those alive.
+        """
+        self.debug_frame = tk.Frame(self)
+        self.debug_text = tk.StringVar()
+        self.debug_label = tk.Label(
+            self.debug_frame,
+            textvariable=self.debug_text,
+            font=DEBUG_FONT,
+            justify=tk.LEFT,
+            anchor=tk.W,
+        )
+        self.debug_label.pack(side=tk.LEFT, fill=tk.X)
+        self.debug_frame.pack(side=tk.BOTTOM, fill=tk.X, before=self.main_frame)
+        self.bind_all("<Destroy>", self._widget_destroyed, add="+")
+        self._refresh_profile()
+        if self.profile_path is not None:
+            self._dump_profile()
+
+    def _widget_destroyed(self, _) -> None:
+        """Callback on any widget's Destroy event, count it."""
+        self.profiler.count("widgets.destroyed")
+
+    def _count_widgets(self) -> int:
+        """Number of widgets alive in window."""
+        widgets = 0
+        parents: list[tk.Misc] = [self]
+        while parents:
+            children = parents.pop().winfo_children()
+            widgets += len(children)
+            parents += children
+        return widgets
+
+    def _refresh_profile(self) -> None:
+        """Update widget and query cache counts and debug panel text, then refresh again after PROFILE_REFRESH_MS."""
+        live = self._count_widgets()
+        self.profiler.set_count("widgets.live", live)
+        self.profiler.set_count(
+            "widgets.created", live + self.profiler.counts["widgets.destroyed"]
+        )
+        for name, value in self.grocery.query_cache.stats().items():
+            self.profiler.set_count(f"query_cache.{name}", value)
+        self.debug_text.set(self.profiler.summary())
+        self.after(PROFILE_REFRESH_MS, self._refresh_profile)
+
+    def _dump_profile(self) -> None:
+        """Dump profiler report to profile path, then again after PROFILE_DUMP_MS."""
+        self.profiler.dump(self.profile_path)
+        self.after(PROFILE_DUMP_MS, self._dump_profile)
+
+    def load(self, loader: Callable[[Progress], BaseGroceryList]) -> None:
+        """Load grocery list on a worker thread, swapping it in for current grocery list once loaded.
+
+        Loader is passed a progress callback to report with. Adding and exporting are disabled meanwhile.
+        """
+        if self.profiler is not None:
+            loader = self.profiler.wrap("import", loader)
+        self._run_task(IMPORT_STATUS, loader, self._loaded)
+
+    def _loaded(self, grocery: BaseGroceryList) -> None:
+        """Callback once grocery list loaded, close placeholder list and show loaded one."""
+        self.unsubscribe()
+        self.history.close()
+        self.grocery.close()
+        self.grocery = grocery
+        if self.profiler is not None:
+            self.profiler.instrument(grocery, PROFILED_GROCERY_OPS, prefix="grocery.")
+        self.unsubscribe = grocery.subscribe(self._grocery_changed)
+        self.history = History(grocery, self.history_depth)
+        self._make_list()
+        self._refresh_summary()
+
+    def _poll_watch(self) -> None:
+        """Apply rows other programs changed in watched csv to grocery list, then poll again after WATCH_POLL_MS.
+
+        Changes are applied as one batch, so patched into the shown list together and undone as one step. Skipped while a background task swaps in or exports
+        the list, the edit then being picked up on a later poll. A half written edit that does not parse is
+        left until the file next changes. Next poll is scheduled first, so an unexpected error does not stop watching.
+        """
+        self.after(WATCH_POLL_MS, self._poll_watch)
+        if self.task is None:
+            try:
+                self.watcher.poll(self.grocery)
+            except ItemParseError:
+                pass
+
+    def _undo(self, _) -> None:
+        """Callback for Ctrl+Z, undo last change to grocery list, patched into shown list as any change is.
+
+        Ignored on item menu, whose form may hold the item being undone, and while a background task runs.
+        """
+        if self.task is None and self.main_frame.winfo_ismapped():
+            self.history.undo()
+
+    def _redo(self, _) -> None:
+        """Callback for Ctrl+Y, redo last undone change to grocery list, ignored as undo is."""
+        if self.task is None and self.main_frame.winfo_ismapped():
+            self.history.redo()
+
+    def _export(self) -> None:
+        """Callback for export button, write items as they are now to csv on a worker thread."""
+        items = self.grocery.item_list
+        outpath = self.grocery.outpath
+        export = partial(items_to_csv_chunked, items, outpath)
+        if self.profiler is not None:
+            export = self.profiler.wrap("export", export)
+        self._run_task(EXPORT_STATUS, lambda progress: export(progress=progress))
+
+    def _run_task(
+        self,
+        status: str,
+        func: Callable[[Progress], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """Start function as background task, show its progress and poll it from the Tk loop.
+
+        On success on_done is called with function's result on the Tk thread, failure is shown as an error.
+        """
+        self.task = BackgroundTask(func)
+        self.task_status.set(status)
+        self.progress_bar.configure(value=0, maximum=1)
+        self.add_button.configure(state=tk.DISABLED)
+        self.export_button.configure(state=tk.DISABLED)
+        self.task_frame.grid()
+        self.after(TASK_POLL_MS, self._poll_task, on_done)
+
+    def _poll_task(self, on_done: Optional[Callable[[Any], None]]) -> None:
+        """Take queued events of running task, updating progress, hiding progress when task ends however it ends."""
+        if self.task is None:
+            return
+        for event, value in self.task.poll():
+            if event == PROGRESS:
+                done, total = value
+                self.progress_bar.configure(value=done, maximum=max(total, done, 1))
+                continue
+            self.task = None
+            self.add_button.configure(state=tk.NORMAL)
+            self.export_button.configure(state=tk.NORMAL)
+            self.task_frame.grid_remove()
+            if event == DONE and on_done is not None:
+                on_done(value)
+            elif event == FAILED:
+                messagebox.showerror(TITLE, str(value))
+            return
+        self.after(TASK_POLL_MS, self._poll_task, on_done)
+
+    def _cancel_task(self) -> None:
+        """Callback for cancel button, ask running task to stop."""
+        if self.task is not None:
+            self.task.cancel()
+
+    def _make_menu(self) -> None:
+        """Function to make item menu buttons for done, delete and back and make item menu form, built once.
 
-    def _make_menu(self, item: Item) -> None:
-        """Function to make item menu buttons for done and delete and make item menu form"""
-        for widget in self.menu_grid_frame.winfo_children():
-            widget.destroy()
+        Done button is only enabled while name and price entries hold a valid item.
+        """
         self.done_button = tk.Button(
             self.menu_grid_frame,
             width=MENU_BUTTON_WIDTH,
             height=MENU_BUTTON_HEIGHT,
-            font=tkf.Font(size=MENU_BUTTON_FONT),
+            font=self._font(MENU_BUTTON_FONT),
             text=DONE_BUTTON_PROMPT,
-            command=partial(self._update_done, item),
+            command=self._update_done,
         )
         self.done_button.pack(side=tk.BOTTOM)
         self.delete_button = tk.Button(
             self.menu_grid_frame,
             width=MENU_BUTTON_WIDTH,
             height=MENU_BUTTON_HEIGHT,
-            font=tkf.Font(size=MENU_BUTTON_FONT),
+            font=self._font(MENU_BUTTON_FONT),
             text=DELETE_BUTTON_PROMPT,
-            command=partial(self._delete_done, item),
         )
         self.delete_button.pack(side=tk.BOTTOM)
         self.back_button = tk.Button(
             self.menu_grid_frame,
             width=MENU_BUTTON_WIDTH,
             height=MENU_BUTTON_HEIGHT,
-            font=tkf.Font(size=MENU_BUTTON_FONT),
+            font=self._font(MENU_BUTTON_FONT),
             text=BACK_BUTTON_PROMPT,
             command=self.go_home,
         )
         self.back_button.pack(side=tk.BOTTOM)
-        self._make_menu_form(item)
+        self._make_menu_form()
+        self.itemname.trace_add("write", self._check_item)
+        self.itemprice.trace_add("write", self._check_item)
+
+    def _make_menu_form(self) -> None:
+        """Construct Form for Item Update or Addition, entries bound to the item StringVars filled in by go_menu.
 
-    def _make_menu_form(self, item: Item) -> None:
-        """Construct Form and Done Button for Item Update or Addition.
-        For item update, add item existing fields to default fill ins.
+        Anything wrong with the entries is shown under them as typed.
         """
         self.menu_form = tk.Frame(self.menu_grid_frame)
-        self.itemname.set(f"{item.name}")
-        self.itemprice.set(f"{item.price}")
-        self.itempriority.set(f"{item.priority.value}")
-        self.itemsupply.set(f"{item.supply.value}")
-        self.itemkitchen.set(f"{item.kitchen_area.value}")
-        self.itemgrocer.set(f"{item.grocer_area.value}")
-
         self.name_label = tk.Label(
-            self.menu_form, text=NAME_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=NAME_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.name_entry = tk.Entry(
             self.menu_form,
             textvariable=self.itemname,
-            font=tkf.Font(size=MENU_BUTTON_FONT),
+            font=self._font(MENU_BUTTON_FONT),
         )
         self.price_label = tk.Label(
-            self.menu_form, text=PRICE_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=PRICE_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.price_entry = tk.Entry(
             self.menu_form,
             textvariable=self.itemprice,
-            font=tkf.Font(size=MENU_BUTTON_FONT),
+            font=self._font(MENU_BUTTON_FONT),
         )
         self.priority_label = tk.Label(
-            self.menu_form, text=PRIORITY_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=PRIORITY_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.priority_dropdown = tk.OptionMenu(
             self.menu_form, self.itempriority, *[opt.value for opt in Priority]
         )
         self.supply_label = tk.Label(
-            self.menu_form, text=SUPPLY_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=SUPPLY_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.supply_dropdown = tk.OptionMenu(
             self.menu_form, self.itemsupply, *[opt.value for opt in Supply]
         )
         self.kitchen_label = tk.Label(
-            self.menu_form, text=KITCHEN_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=KITCHEN_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.kitchen_dropdown = tk.OptionMenu(
             self.menu_form, self.itemkitchen, *[opt.value for opt in KitchenArea]
         )
         self.grocer_label = tk.Label(
-            self.menu_form, text=GROCER_TEXT, font=tkf.Font(size=MENU_LABEL_FONT)
+            self.menu_form, text=GROCER_TEXT, font=self._font(MENU_LABEL_FONT)
         )
         self.grocer_dropdown = tk.OptionMenu(
             self.menu_form, self.itemgrocer, *[opt.value for opt in GrocerArea]
         )
+        self.error_label = tk.Label(
+            self.menu_form,
+            textvariable=self.item_error,
+            fg=ERROR_COLOUR,
+            font=self._font(OPTION_LABEL_FONT),
+        )
 
         self.name_label.grid(column=0, row=0)
         self.name_entry.grid(column=1, row=0)
@@ -270,85 +707,263 @@ class GUI(tk.Tk):
         self.kitchen_dropdown.grid(column=1, row=4)
         self.grocer_label.grid(column=0, row=5)
         self.grocer_dropdown.grid(column=1, row=5)
+        self.error_label.grid(column=0, row=6, columnspan=2)
         self.menu_form.pack()
 
+    def _fill_menu(self, item: Item) -> None:
+        """Fill item menu in with item's fields, delete button deleting item, disabled if item is not on list."""
+        self.itemname.set(f"{item.name}")
+        self.itemprice.set(f"{item.price}")
+        self.itempriority.set(f"{item.priority.value}")
+        self.itemsupply.set(f"{item.supply.value}")
+        self.itemkitchen.set(f"{item.kitchen_area.value}")
+        self.itemgrocer.set(f"{item.grocer_area.value}")
+        self.delete_button.configure(
+            command=partial(self._delete_done, item),
+            state=tk.NORMAL if item.name in self.grocery else tk.DISABLED,
+        )
+
+    def _check_item(self, *_) -> None:
+        """Trace callback on name and price entries, show what is wrong with them and enable done button only if nothing is."""
+        error = entry_error(self.itemname.get(), self.itemprice.get())
+        self.item_error.set(error)
+        self.done_button.configure(state=tk.DISABLED if error else tk.NORMAL)
+
     def _make_list(self) -> None:
         """Function to make list of grocery items based on grocery item list.
 
-        Grocery item list is list after applied filters and also reduced by search query.
-        Forgets old buttons and makes new ones. Each button calls update to go to its item menu with itself as item arg.
+        Grocery item list is list after applied filters and also reduced by search query, in one grocery list query.
+        Items are in list order or in the chosen sort order, kept sorted by the grocery list rather than sorted here.
+        In fuzzy mode search query instead picks best matches for misspelled names, best first.
+        Only rows in view get buttons, pooled buttons are rebound rather than remade, and view goes back to top.
         """
-        for widget in self.list_subframe.winfo_children():
-            widget.destroy()
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
+        term = self.search_term.get()
+        self.shown_search = term
+        self.shown_fuzzy = bool(self.fuzzy.get() and term)
+        self.shown_order = sort_order(SORT_ORDERS[self.sort_by.get()])
+        self.list_dirty = False
+        if self.shown_fuzzy:
+            self.show_list = self.grocery.fuzzy_search(term, **self.applied_filters)
+        else:
+            self.show_list = self.grocery.query(
+                **self.applied_filters, search=term, order=self.shown_order
+            )
+        self.canvas.yview_moveto(0.0)
+        self.scroll_canvas(None)
 
-        show_list = [
-            item for item in self.filter_list if self.search_term.get() in item.name
-        ]
+    def _sort_chosen(self, _) -> None:
+        """Callback on sort choice, remake list in chosen order."""
+        self._make_list()
+
+    def _search_typed(self, *_) -> None:
+        """Callback on search box edit, remake list once typing pauses for SEARCH_DEBOUNCE_MS."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self._make_list)
+
+    def _draw_rows(self) -> None:
+        """Bind pooled buttons to rows from top of canvas view down, hiding buttons past the end of list.
 
-        self.list_items = [
-            tk.Button(
-                self.list_subframe,
-                width=LIST_ENTRY_WIDTH,
-                height=LIST_ENTRY_HEIGHT,
-                font=tkf.Font(size=LIST_ENTRY_FONT),
+        Each button calls row clicked with its row's item, selected rows highlighted.
+        Buttons already showing the same item at the same row, selected or not as before, are left alone.
+        """
+        first_row = int(self.canvas.canvasy(0)) // self.row_height
+        for offset, (btn, window) in enumerate(zip(self.list_items, self.list_windows)):
+            row = first_row + offset
+            if row >= len(self.show_list):
+                if self.drawn_rows[offset] is not None:
+                    self.canvas.itemconfigure(window, state=tk.HIDDEN)
+                    self.drawn_rows[offset] = None
+                continue
+            item = self.show_list[row]
+            selected = item.name in self.selected
+            drawn = self.drawn_rows[offset]
+            if (
+                drawn is not None
+                and drawn[0] == row
+                and drawn[1] is item
+                and drawn[2] == selected
+            ):
+                continue
+            btn.configure(
                 text=item.name,
-                command=partial(self._update, item),
+                command=partial(self._row_clicked, item),
+                background=SELECTED_COLOUR if selected else self.list_bg,
             )
-            for item in show_list
+            self.canvas.coords(window, 0, row * self.row_height)
+            self.canvas.itemconfigure(window, state=tk.NORMAL)
+            self.drawn_rows[offset] = (row, item, selected)
+
+    def _row_clicked(self, item: Item) -> None:
+        """Callback for a list row, toggle item's selection in select mode, else go to its item menu."""
+        if not self.select_mode.get():
+            self._update(item)
+            return
+        if item.name in self.selected:
+            self.selected.remove(item.name)
+        else:
+            self.selected.add(item.name)
+        self.selection_text.set(selection_text(len(self.selected)))
+        self._draw_rows()
+
+    def _select_mode_changed(self) -> None:
+        """Callback on select mode toggle, selection dropped on leaving select mode."""
+        if not self.select_mode.get():
+            self._clear_selection()
+
+    def _clear_selection(self) -> None:
+        """Deselect every item, redrawing rows that were highlighted."""
+        self.selected.clear()
+        self.selection_text.set(selection_text(0))
+        self._draw_rows()
+
+    def _set_selected(self) -> None:
+        """Callback for set selected button, set chosen supply and priority on every selected item in one batch.
+
+        Grocery list tells the GUI of the whole batch at once, so the list is patched and redrawn once.
+        Selection is cleared after.
+        """
+        fields: dict[str, Enum] = {}
+        if self.bulk_supply.get() != KEEP_TEXT:
+            fields["supply"] = Supply[self.bulk_supply.get()]
+        if self.bulk_priority.get() != KEEP_TEXT:
+            fields["priority"] = Priority[self.bulk_priority.get()]
+        items = [
+            item for item in map(self.grocery.get, self.selected) if item is not None
         ]
+        if fields and items:
+            self.grocery.set_fields(items, **fields)
+        self._clear_selection()
+
+    def _grocery_changed(self, event: Union[Change, Batch]) -> None:
+        """Observer of grocery list, patch shown list for a change or batch of changes then redraw once idle.
 
-        for btn in self.list_items:
-            btn.pack()
+        Changed item is swapped in, dropped or appended where it shows in list order, or moved to its place
+        in sort order. List is remade instead when that place cannot be told, for a fuzzy search
+        or an item updated into view of an unsorted list, or when a batch is too big to patch change by change.
+        Deleted items are deselected and summary is refreshed once idle too.
+        """
+        changes = event.changes if isinstance(event, Batch) else (event,)
+        for change in changes:
+            if change.op == DELETE:
+                self.selected.discard(change.item.name)
+        self.selection_text.set(selection_text(len(self.selected)))
+        if self.summary_job is None:
+            self.summary_job = self.after_idle(self._refresh_summary)
+        if self.shown_fuzzy or len(changes) > BATCH_PATCH_LIMIT:
+            self.list_dirty = True
+        elif not any([self._patch_list(change) for change in changes]):
+            return
+        if self.redraw_job is None:
+            self.redraw_job = self.after_idle(self._redraw)
+
+    def _patch_list(self, change: Change) -> bool:
+        """Apply change to shown list, returning whether shown list changed."""
+        old_item = change.item if change.op == DELETE else change.old
+        row = None if old_item is None else self._shown_row(old_item)
+        shows = change.op != DELETE and self._shows(change.item)
+        if self.shown_order is not None:
+            if row is None and not shows:
+                return False
+            if row is not None:
+                del self.show_list[row]
+            if shows:
+                insort(self.show_list, change.item, key=self._shown_key)
+            return True
+        if row is not None and shows:
+            self.show_list[row] = change.item
+        elif row is not None:
+            del self.show_list[row]
+        elif shows and change.op == ADD:
+            self.show_list.append(change.item)
+        elif shows and change.op == UPDATE:
+            self.list_dirty = True
+        else:
+            return False
+        return True
+
+    def _shown_row(self, old_item: Item) -> Optional[int]:
+        """Row of shown list holding old item, None if not shown. Found by bisection when list is sorted."""
+        if self.shown_order is not None:
+            row = bisect_left(
+                self.show_list, self._shown_key(old_item), key=self._shown_key
+            )
+            if row < len(self.show_list) and self.show_list[row].name == old_item.name:
+                return row
+            return None
+        for row, item in enumerate(self.show_list):
+            if item.name == old_item.name:
+                return row
+        return None
+
+    def _shown_key(self, item: Item) -> tuple:
+        """Key of item in shown sort order."""
+        return sort_key(item, self.shown_order)
+
+    def _shows(self, item: Item) -> bool:
+        """Check item belongs on shown list, matching applied filters and containing shown search term."""
+        return self.shown_search in item.name and matches_filters(
+            item, filter_fields(**self.applied_filters)
+        )
+
+    def _redraw(self) -> None:
+        """Redraw list after grocery list changes, remaking it only if marked dirty."""
+        self.redraw_job = None
+        if self.list_dirty:
+            self._make_list()
+        else:
+            self.scroll_canvas(None)
 
     def _make_filter_checkboxes(self) -> None:
-        """Function to make filter form with checkboxes for each type of filter and value."""
-        for widget in self.filter_frame.winfo_children():
-            widget.destroy()
+        """Function to make filter form with checkboxes for each type of filter and value, built once."""
         self.priority_label = tk.Label(
-            self.filter_frame, text=PRIORITY_TEXT, font=tkf.Font(size=MAIN_LABEL_FONT)
+            self.filter_frame, text=PRIORITY_TEXT, font=self._font(MAIN_LABEL_FONT)
         )
         self.priority_boxes = [
             tk.Checkbutton(
                 self.filter_frame,
                 text=mem.value,
                 variable=self.filterprior[mem],
-                font=tkf.Font(size=OPTION_LABEL_FONT),
+                font=self._font(OPTION_LABEL_FONT),
             )
             for mem in Priority
         ]
         self.supply_label = tk.Label(
-            self.filter_frame, text=SUPPLY_TEXT, font=tkf.Font(size=MAIN_LABEL_FONT)
+            self.filter_frame, text=SUPPLY_TEXT, font=self._font(MAIN_LABEL_FONT)
         )
         self.supply_boxes = [
             tk.Checkbutton(
                 self.filter_frame,
                 text=mem.value,
                 variable=self.filtersupply[mem],
-                font=tkf.Font(size=OPTION_LABEL_FONT),
+                font=self._font(OPTION_LABEL_FONT),
             )
             for mem in Supply
         ]
         self.kitchen_label = tk.Label(
-            self.filter_frame, text=KITCHEN_TEXT, font=tkf.Font(size=MAIN_LABEL_FONT)
+            self.filter_frame, text=KITCHEN_TEXT, font=self._font(MAIN_LABEL_FONT)
         )
         self.kitchen_boxes = [
             tk.Checkbutton(
                 self.filter_frame,
                 text=mem.value,
                 variable=self.filterkitchen[mem],
-                font=tkf.Font(size=OPTION_LABEL_FONT),
+                font=self._font(OPTION_LABEL_FONT),
             )
             for mem in KitchenArea
         ]
         self.grocer_label = tk.Label(
-            self.filter_frame, text=GROCER_TEXT, font=tkf.Font(size=MAIN_LABEL_FONT)
+            self.filter_frame, text=GROCER_TEXT, font=self._font(MAIN_LABEL_FONT)
         )
         self.grocer_boxes = [
             tk.Checkbutton(
                 self.filter_frame,
                 text=mem.value,
                 variable=self.filtergrocer[mem],
-                font=tkf.Font(size=OPTION_LABEL_FONT),
+                font=self._font(OPTION_LABEL_FONT),
             )
             for mem in GrocerArea
         ]
@@ -366,15 +981,34 @@ class GUI(tk.Tk):
         for cbox in self.grocer_boxes:
             cbox.pack(side=tk.TOP)
 
+    def _make_summary(self) -> None:
+        """Make summary panel of item counts and price totals for applied filters, built once."""
+        self.summary_label = tk.Label(
+            self.summary_frame, text=SUMMARY_LABEL, font=self._font(OPTION_LABEL_FONT)
+        )
+        self.summary_body = tk.Label(
+            self.summary_frame,
+            textvariable=self.summary_text,
+            font=SUMMARY_FONT,
+            justify=tk.LEFT,
+        )
+        self.summary_label.pack(side=tk.TOP)
+        self.summary_body.pack(side=tk.TOP)
+
+    def _refresh_summary(self) -> None:
+        """Show totals of items matching applied filters, kept by the grocery list rather than counted here."""
+        self.summary_job = None
+        self.summary_text.set(
+            summary_text(self.grocery.summary(**self.applied_filters))
+        )
+
     def _make_filter_buttons(self):
         """Functions to populate the buttons for applying/clearing filters."""
-        for widget in self.filter_button_frame.winfo_children():
-            widget.destroy()
         self.apply_button = tk.Button(
             self.filter_button_frame,
             width=FILTER_BUTTON_WIDTH,
             height=FILTER_BUTTON_HEIGHT,
-            font=tkf.Font(size=FILTER_BUTTON_FONT),
+            font=self._font(FILTER_BUTTON_FONT),
             text=APPLY_BUTTON_PROMPT,
             command=self._apply_filters,
         )
@@ -382,7 +1016,7 @@ class GUI(tk.Tk):
             self.filter_button_frame,
             width=FILTER_BUTTON_WIDTH,
             height=FILTER_BUTTON_HEIGHT,
-            font=tkf.Font(size=FILTER_BUTTON_FONT),
+            font=self._font(FILTER_BUTTON_FONT),
             text=CLEAR_BUTTON_PROMPT,
             command=self._clear_filters,
         )
@@ -401,42 +1035,55 @@ class GUI(tk.Tk):
         self.go_menu(old_item)
 
     def go_menu(self, incoming_item: Item) -> None:
-        """Function to switch frames so item menu in scope and make menu based on current item."""
+        """Function to switch frames so item menu in scope and fill menu in with current item."""
         self.main_frame.pack_forget()
-        self._make_menu(incoming_item)
+        self._fill_menu(incoming_item)
         self.menu_grid_frame.pack()
 
     def go_home(self):
-        """Function to switch frames from item menu to main menu, remove default entry values, repopulate grocery list."""
+        """Function to switch frames from item menu to main menu, remove default entry values.
+
+        Buttons and checkboxes are kept as built and edits were already patched into the list as made,
+        so grocery list is only remade if clearing the search term changes it.
+        Clearing the search term cancels the remake its edit schedules, which would scroll the list back to the top.
+        """
         self.itemname.set(EMPTY)
         self.itemprice.set(EMPTY)
         self.itempriority.set(EMPTY)
         self.itemsupply.set(EMPTY)
         self.itemkitchen.set(EMPTY)
         self.itemgrocer.set(EMPTY)
-        self.search_term.set(EMPTY)
+        if self.search_term.get():
+            self.search_term.set(EMPTY)
+            self.after_cancel(self.search_job)
+            self.search_job = None
 
         self.menu_grid_frame.pack_forget()
         self.main_frame.pack()
-        self._make_buttons()
-        self._apply_filters()
-        self._make_filter_checkboxes()
-        self._make_list()
+        if self.shown_search:
+            self._make_list()
 
-    def _update_done(self, new_item: Item):
-        """When done with update, set new item and add to grocery list, deleting old item if any..
+    def _update_done(self):
+        """When done with update, make new item and replace old item with it on grocery list, old item may be empty.
 
         Set new item fields based on dropdown/entry fields in item menu, modify grocery list, call switch frames.
+        Stays on item menu if entries are invalid or new name belongs to another item.
         """
-        new_item.name = self.itemname.get()
-        new_item.price = float(self.itemprice.get())
-        new_item.priority = Priority[self.itempriority.get()]
-        new_item.supply = Supply[self.itemsupply.get()]
-        new_item.kitchen_area = KitchenArea[self.itemkitchen.get()]
-        new_item.grocer_area = GrocerArea[self.itemgrocer.get()]
-
-        self.grocery.delete(self.old_item)
-        self.grocery.add(new_item)
+        if entry_error(self.itemname.get(), self.itemprice.get()):
+            return
+        new_item = Item(
+            name=self.itemname.get(),
+            price=float(self.itemprice.get()),
+            priority=Priority[self.itempriority.get()],
+            supply=Supply[self.itemsupply.get()],
+            kitchen_area=KitchenArea[self.itemkitchen.get()],
+            grocer_area=GrocerArea[self.itemgrocer.get()],
+        )
+        try:
+            self.grocery.replace(self.old_item, new_item)
+        except DuplicateItemError as err:
+            messagebox.showerror(TITLE, str(err))
+            return
         self.go_home()
 
     def _delete_done(self, del_item: Item):
@@ -457,29 +1104,61 @@ class GUI(tk.Tk):
         ]:
             for value in map.values():
                 value.set(1)
-        self._make_filter_checkboxes()
         self._apply_filters()
 
     def _apply_filters(self):
         """Based on values in checkbox maps in each type of filter, find appropriate filters, then apply them to filtere items.
 
-        Keep applying filters until list fully reduced and reload grocery list.
+        Filters are kept as applied until next apply, all used together in a single grocery list query on reload,
+        and summary totals follow them.
         """
-        self.filter_list = [item for item in self.grocery.item_list]
-        prior_filters = [mem for mem, flag in self.filterprior.items() if flag.get()]
-        self.filter_list = self.grocery.filter_priorities(
-            self.grocery.item_list, prior_filters
-        )
-        supply_filters = [mem for mem, flag in self.filtersupply.items() if flag.get()]
-        self.filter_list = self.grocery.filter_supplies(
-            self.filter_list, supply_filters
-        )
-        kitchen_filters = [
-            mem for mem, flag in self.filterkitchen.items() if flag.get()
-        ]
-        self.filter_list = self.grocery.filter_kitchen(
-            self.filter_list, kitchen_filters
-        )
-        grocer_filters = [mem for mem, flag in self.filtergrocer.items() if flag.get()]
-        self.filter_list = self.grocery.filter_grocer(self.filter_list, grocer_filters)
+        self.applied_filters = {
+            "priorities": [mem for mem, flag in self.filterprior.items() if flag.get()],
+            "supplies": [mem for mem, flag in self.filtersupply.items() if flag.get()],
+            "kitchen": [mem for mem, flag in self.filterkitchen.items() if flag.get()],
+            "grocer": [mem for mem, flag in self.filtergrocer.items() if flag.get()],
+        }
         self._make_list()
+        self._refresh_summary()
+
+    def _close(self) -> None:
+        """Callback on window close, cancel any running task, dump any profile, then close window."""
+        self._cancel_task()
+        if self.profiler is not None and self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
+        self.destroy()
+
+
+def entry_error(name: str, price: str) -> str:
+    """What is wrong with item menu name and price entries, empty if nothing."""
+    if not name:
+        return NAME_REQUIRED
+    try:
+        value = float(price)
+    except ValueError:
+        return PRICE_INVALID
+    if not math.isfinite(value) or value < 0:
+        return PRICE_INVALID
+    return EMPTY
+
+
+def summary_text(summary: Summary) -> str:
+    """Summary as lines of counts and price totals, each field's members with no items left out."""
+
+    def line(label: str, totals: Totals) -> str:
+        return f"{label:<18}{totals.count:>7} {totals.total:>12.2f}"
+
+    lines = [line(ALL_ITEMS_TEXT, summary.items), line(TO_BUY_TEXT, summary.to_buy)]
+    for key, members in summary.by_field.items():
+        lines.append(FIELD_TEXTS[key])
+        lines += [
+            line(f"  {member.value}", totals)
+            for member, totals in members.items()
+            if totals.count
+        ]
+    return "\n".join(lines)
+
+
+def selection_text(count: int) -> str:
+    """Label of how many items are selected."""
+    return f"{count} selected"
@@ -0,0 +1,84 @@
+from collections import deque
+from typing import Union
+
+from groceries.grocer_list import (
+    ADD,
+    DELETE,
+    PUT,
+    BaseGroceryList,
+    Batch,
+    Change,
+)
+from groceries.item import Item
+
+HISTORY_DEPTH: int = 100
+
+Step = tuple[Change, ...]
+
+
+class History:
+    """Undo and redo of the changes made to a grocery list, recorded as an observer of it.
+
+    A step is the Change or Batch of changes the list told of, so a bulk edit, watched csv edit or ingest
+    is one step. Steps hold the items they swapped rather than a copy of the list, so each step costs memory
+    for its changed items only. Undo applies a step's inverse and redo the step again, each as one batch. At most depth steps are kept, oldest dropped first,
+    and any new change clears steps undone so far. Undone deletes put items back at the end of list order.
+    """
+
+    def __init__(self, grocery: BaseGroceryList, depth: int = HISTORY_DEPTH) -> None:
+        self.grocery = grocery
+        self.undo_steps: deque[Step] = deque(maxlen=depth)
+        self.redo_steps: list[Step] = []
+        self.replaying = False
+        self.unsubscribe = grocery.subscribe(self._changed)
+
+    def _changed(self, event: Union[Change, Batch]) -> None:
+        """Observer of grocery list, record change or batch as a step unless it is one being replayed."""
+        if self.replaying:
+            return
+        self.undo_steps.append(event.changes if isinstance(event, Batch) else (event,))
+        self.redo_steps.clear()
+
+    def undo(self) -> bool:
+        """Revert last step not undone, returning whether there was one."""
+        if not self.undo_steps:
+            return False
+        step = self.undo_steps.pop()
+        self._replay([_inverse(change) for change in reversed(step)])
+        self.redo_steps.append(step)
+        return True
+
+    def redo(self) -> bool:
+        """Make last undone step again, returning whether there was one."""
+        if not self.redo_steps:
+            return False
+        step = self.redo_steps.pop()
+        self._replay([_forward(change) for change in step])
+        self.undo_steps.append(step)
+        return True
+
+    def close(self) -> None:
+        """Stop recording changes."""
+        self.unsubscribe()
+
+    def _replay(self, ops: list[tuple[str, Item]]) -> None:
+        """Apply ops to grocery list as one batch, without recording them as a new step."""
+        self.replaying = True
+        try:
+            self.grocery.apply_batch(ops)
+        finally:
+            self.replaying = False
+
+
+def _inverse(change: Change) -> tuple[str, Item]:
+    """Mutation undoing change."""
+    if change.op == ADD:
+        return DELETE, change.item
+    if change.op == DELETE:
+        return PUT, change.item
+    return PUT, change.old
+
+
+def _forward(change: Change) -> tuple[str, Item]:
+    """Mutation making change again."""
+    return (DELETE if change.op == DELETE else PUT), change.item
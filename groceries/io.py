@@ -1,50 +1,432 @@
+import csv
+import os
+from contextlib import ExitStack
 from enum import Enum
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Sized,
+)
 
-import pandas as pd
-from groceries.item import GrocerArea, Item, KitchenArea, Priority, Supply
+from groceries.constants import EMPTY
+from groceries.item import ITEM_ENUMS, Item
 
-VAL_ENUM_MAP = {
-    "priority": Priority,
-    "supply": Supply,
-    "grocer_area": GrocerArea,
-    "kitchen_area": KitchenArea,
+if TYPE_CHECKING:
+    import pandas as pd
+
+VAL_ENUM_MAP = ITEM_ENUMS
+ITEM_FIELDS: list[str] = list(Item.__annotations__.keys())
+CSV_ENUM_VALUES: dict[Enum, str] = {
+    member: member.value.lower() for enum in VAL_ENUM_MAP.values() for member in enum
 }
+HEADER_LINES: int = 1
+CSV_CHUNK_ROWS: int = 10_000
+CSV_ENCODING: str = "utf-8"
+CSV_READ_ENCODING: str = "utf-8-sig"
+CSV_ENGINE: str = "csv"
+PANDAS_ENGINE: str = "pandas"
+ENGINES: tuple[str, ...] = (CSV_ENGINE, PANDAS_ENGINE)
+REJECT_FIELDS: tuple[str, ...] = ("line", "errors")
+
+Progress = Callable[[int, int], None]
+
 
+class ItemParseError(ValueError):
+    """Raised when csv cells do not parse as their column's type, enum cells naming no member of their Enum.
+
+    Errors are kept as (line, column, value) tuples, line being the line number in the csv file.
+    """
 
-def items_from_csv(path: Path) -> list[Item]:
+    def __init__(self, errors: list[tuple[int, str, str]]) -> None:
+        self.errors = sorted(errors)
+        report = "\n".join(
+            f"  line {line}: {key}={value!r}" for line, key, value in self.errors
+        )
+        super().__init__(f"{len(self.errors)} invalid value(s):\n{report}")
+
+    def __reduce__(self) -> tuple:
+        """Pickle by errors rather than message, so errors survive being raised in a worker process."""
+        return type(self), (self.errors,)
+
+
+def items_from_csv(
+    path: Path, progress: Optional[Progress] = None, engine: str = CSV_ENGINE
+) -> list[Item]:
     """Import input csv of grocery items as grocery item list.
     Mapping column feature to Enum and value in csv at column to that Enum's value.
 
-    Then construct item class using unpacked dictionary mapping.
+    Default csv engine reads rows with the stdlib csv module, pandas engine converts columns whole then
+    constructs items in one pass, pandas only being imported when used.
+    If progress given, every CSV_CHUNK_ROWS rows report bytes read out of file size.
+    Files are read as utf-8 with or without a byte order mark, blank cells read as empty strings by either engine.
+    Raises ItemParseError listing every bad value in the file, a blank price being one.
     """
-    pd_csv = pd.read_csv(path)
-    grocer_list = []
-    for _, row in pd_csv.iterrows():
-        row_dict: dict[str, Any] = dict(row)
-        dataclass_dir = {
-            key: VAL_ENUM_MAP[key][value.upper()] if key in VAL_ENUM_MAP else value
-            for key, value in row_dict.items()
-        }
-        grocer_list.append(Item(**dataclass_dir))
-    return grocer_list
+    _check_engine(engine)
+    if engine == CSV_ENGINE:
+        return _items_from_csv_rows(path, progress)
 
+    import pandas as pd
 
-def items_to_csv(item_list: list[Item], path: Path) -> pd.DataFrame:
-    """Import input csv of grocery items as grocery item list.
-    If value is part of enums, get string value and lowercase. If string value, just lowercase, anything else just equal value like price."""
-    df = pd.DataFrame(columns=list(Item.__annotations__.keys()))
-    for item in item_list:
-        item_dict = item.__dict__
-        df_dict: dict[str, Union[str, float]] = {
-            key: value.value.lower()
-            if isinstance(value, Enum)
-            else value.lower()
-            if type(value) == str
-            else value
-            for key, value in item_dict.items()
-        }
-        df = df.append(df_dict, ignore_index=True)
+    if progress is None:
+        return _items_from_frame(
+            pd.read_csv(path, encoding=CSV_READ_ENCODING, keep_default_na=False)
+        )
+
+    items: list[Item] = []
+    errors: list[tuple[int, str, str]] = []
+    total = os.path.getsize(path)
+    with open(path, "rb") as csv_file:
+        for chunk in pd.read_csv(
+            csv_file,
+            chunksize=CSV_CHUNK_ROWS,
+            encoding=CSV_READ_ENCODING,
+            keep_default_na=False,
+        ):
+            first_line = HEADER_LINES + 1 + chunk.index[0]
+            try:
+                items += _items_from_frame(chunk, first_line)
+            except ItemParseError as err:
+                errors += err.errors
+            progress(csv_file.tell(), total)
+    if errors:
+        raise ItemParseError(errors)
+    return items
+
+
+def stream_items_from_csv(
+    path: Path,
+    rejects: Optional[Path] = None,
+    batch_rows: int = CSV_CHUNK_ROWS,
+    progress: Optional[Progress] = None,
+) -> Iterator[list[Item]]:
+    """Import csv of grocery items as a stream of batches of at most batch_rows items, read one batch at a time.
+
+    Only one batch of rows is held at once, so memory stays bounded however large the file.
+    Rows with a bad value or the wrong number of fields are left out of their batch and written to
+    rejects csv if given, their line and errors before their fields. Without rejects a bad row raises
+    ItemParseError listing every bad value of its batch. If progress given, each batch reports bytes read out of file size.
+    """
+    total = os.path.getsize(path)
+    with open(path, "rb") as csv_file, ExitStack() as stack:
+        header, batches = _csv_row_batches(csv_file, batch_rows)
+        parsers = {key: _cell_parser(key) for key in header}
+        reject_writer = None
+        if rejects is not None:
+            reject_file = stack.enter_context(
+                open(rejects, "w", newline="", encoding=CSV_ENCODING)
+            )
+            reject_writer = csv.writer(reject_file, lineterminator=os.linesep)
+            reject_writer.writerow([*REJECT_FIELDS, *header])
+        for first_line, rows in batches:
+            try:
+                items = _items_from_rows(rows, header, parsers, first_line)
+            except ItemParseError as err:
+                if reject_writer is None:
+                    raise
+                items = _reject_rows(
+                    rows, header, parsers, first_line, err.errors, reject_writer
+                )
+            if progress is not None:
+                progress(csv_file.tell(), total)
+            if items:
+                yield items
+
+
+def items_from_rows(rows: list[list[str]], header: list[str]) -> list[Item]:
+    """Convert csv rows under header, as the stdlib csv reader splits them, to items.
+
+    Raises ItemParseError listing every bad value, lines counted from the first row as the line after the header.
+    """
+    parsers = {key: _cell_parser(key) for key in header}
+    return _items_from_rows(rows, header, parsers, HEADER_LINES + 1)
+
+
+def _items_from_csv_rows(path: Path, progress: Optional[Progress] = None) -> list[Item]:
+    """Import csv of grocery items with the stdlib csv module.
+
+    Rows are read CSV_CHUNK_ROWS at a time, each batch converted column by column, then items constructed in one pass.
+    """
+    items: list[Item] = []
+    errors: list[tuple[int, str, str]] = []
+    total = os.path.getsize(path)
+    with open(path, "rb") as csv_file:
+        header, batches = _csv_row_batches(csv_file, CSV_CHUNK_ROWS)
+        parsers = {key: _cell_parser(key) for key in header}
+        for first_line, rows in batches:
+            try:
+                items += _items_from_rows(rows, header, parsers, first_line)
+            except ItemParseError as err:
+                errors += err.errors
+            if progress is not None:
+                progress(csv_file.tell(), total)
+    if errors:
+        raise ItemParseError(errors)
+    return items
+
+
+def _csv_row_batches(
+    csv_file: BinaryIO, batch_rows: int
+) -> tuple[list[str], Iterator[tuple[int, list[list[str]]]]]:
+    """Header of binary csv file, and its rows read lazily in batches of batch_rows, each with the csv line of its first row."""
+    reader = csv.reader(line.decode(CSV_READ_ENCODING) for line in csv_file)
+    header = next(reader, [])
+
+    def batches() -> Iterator[tuple[int, list[list[str]]]]:
+        first_line = HEADER_LINES + 1
+        while rows := list(islice(reader, batch_rows)):
+            yield first_line, rows
+            first_line += len(rows)
+
+    return header, batches()
+
+
+def _reject_rows(
+    rows: list[list[str]],
+    header: list[str],
+    parsers: dict[str, Callable[[str], Any]],
+    first_line: int,
+    errors: list[tuple[int, str, str]],
+    reject_writer: Any,
+) -> list[Item]:
+    """Write rows having errors to reject writer, returning items of the rest of the rows."""
+    row_errors: dict[int, list[str]] = {}
+    for line, key, value in errors:
+        row_errors.setdefault(line, []).append(f"{key}={value!r}")
+    for line, row in enumerate(rows, first_line):
+        if line in row_errors:
+            reject_writer.writerow([line, "; ".join(row_errors[line]), *row])
+    kept = [
+        [] if line in row_errors else row for line, row in enumerate(rows, first_line)
+    ]
+    return _items_from_rows(kept, header, parsers, first_line)
+
+
+def _items_from_rows(
+    rows: list[list[str]],
+    header: list[str],
+    parsers: dict[str, Callable[[str], Any]],
+    first_line: int,
+) -> list[Item]:
+    """Convert csv rows to items, first_line being the csv line of the first row.
+
+    Blank rows are skipped. Raises ItemParseError listing every bad cell and every row of the wrong length.
+    """
+    errors: list[tuple[int, str, str]] = []
+    lines = []
+    kept = []
+    for line, row in enumerate(rows, first_line):
+        if len(row) == len(header):
+            lines.append(line)
+            kept.append(row)
+        elif row:
+            errors.append((line, "fields", str(len(row))))
+
+    columns: dict[str, list] = {}
+    for key, cells in zip(header, zip(*kept)):
+        try:
+            columns[key] = list(map(parsers[key], cells))
+        except ValueError:
+            errors += _column_errors(cells, lines, key, parsers[key])
+    if errors:
+        raise ItemParseError(errors)
+
+    if not kept:
+        return []
+    if sorted(columns) == sorted(ITEM_FIELDS):
+        return list(map(Item, *(columns[key] for key in ITEM_FIELDS)))
+    return [Item(**dict(zip(header, values))) for values in zip(*columns.values())]
+
+
+def _column_errors(
+    cells: Sequence[str], lines: list[int], key: str, parse: Callable[[str], Any]
+) -> list[tuple[int, str, str]]:
+    """Every cell of column key that parse rejects as (line, column, value)."""
+    errors = []
+    for line, cell in zip(lines, cells):
+        try:
+            parse(cell)
+        except ValueError:
+            errors.append((line, key, cell))
+    return errors
+
+
+def _cell_parser(key: str) -> Callable[[str], Any]:
+    """Parser of csv cells in column key, raising ValueError on a bad cell.
+
+    Enum cells are upper cased and looked up once per distinct value, price parsed as float, anything else kept as is.
+    """
+    if key in VAL_ENUM_MAP:
+        members = VAL_ENUM_MAP[key].__members__
+        seen: dict[str, Enum] = {}
+
+        def parse_enum(value: str) -> Enum:
+            try:
+                return seen[value]
+            except KeyError:
+                pass
+            try:
+                member = seen[value] = members[value.upper()]
+            except KeyError:
+                raise ValueError(value) from None
+            return member
+
+        return parse_enum
+    if Item.__annotations__.get(key) is float:
+        return float
+    return str
+
+
+def _items_from_frame(
+    pd_csv: "pd.DataFrame", first_line: int = HEADER_LINES + 1
+) -> list[Item]:
+    """Convert dataframe of csv rows to items, first_line being the csv line of the frame's first row.
+
+    Prices are parsed as the csv engine parses them.
+    Raises ItemParseError listing every bad enum value and price in the frame.
+    """
+    columns: dict[str, list] = {}
+    errors: list[tuple[int, str, str]] = []
+    for key in pd_csv.columns:
+        if key in VAL_ENUM_MAP:
+            columns[key] = _enum_column(pd_csv[key], key, first_line, errors)
+        elif Item.__annotations__.get(key) is float:
+            cells = pd_csv[key].tolist()
+            try:
+                columns[key] = list(map(float, cells))
+            except ValueError:
+                lines = list(range(first_line, first_line + len(cells)))
+                errors += _column_errors(cells, lines, key, float)
+        else:
+            columns[key] = pd_csv[key].tolist()
+    if errors:
+        raise ItemParseError(errors)
+
+    if sorted(columns) == sorted(ITEM_FIELDS):
+        return list(map(Item, *(columns[key] for key in ITEM_FIELDS)))
+    keys = list(columns)
+    return [Item(**dict(zip(keys, values))) for values in zip(*columns.values())]
+
+
+def _enum_column(
+    column: "pd.Series",
+    key: str,
+    first_line: int,
+    errors: list[tuple[int, str, str]],
+) -> list[Enum]:
+    """Map column to Enum members through its categorical codes.
+
+    Each distinct value is upper cased and looked up once, values naming no member are appended to errors with their line
+    and value as in the csv. Blank cells are read as empty strings, so they are reported as the csv engine reports them.
+    """
+    import numpy as np
+
+    categorical = column.fillna(EMPTY).astype(str).astype("category")
+    categories = categorical.cat.categories.tolist()
+    codes = categorical.cat.codes.to_numpy()
+    members = VAL_ENUM_MAP[key].__members__
+    lookup = np.array([members.get(name.upper()) for name in categories], dtype=object)
+
+    bad_codes = [code for code, member in enumerate(lookup) if member is None]
+    bad_rows = np.flatnonzero((codes < 0) | np.isin(codes, bad_codes))
+    for row in bad_rows.tolist():
+        code = codes[row]
+        errors.append((first_line + row, key, categories[code] if code >= 0 else EMPTY))
+    return lookup[codes].tolist()
+
+
+def items_to_csv(item_list: list[Item], path: Path) -> "pd.DataFrame":
+    """Export grocery item list as csv of grocery items, building the dataframe in one bulk pass.
+    If value is part of enums, get string value and lowercase. If string value, just lowercase, anything else just equal value like price.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(_item_columns(item_list), columns=ITEM_FIELDS)
     df.to_csv(path, index=False)
     return df
+
+
+def items_to_csv_chunked(
+    items: Iterable[Item],
+    path: Path,
+    chunksize: int = CSV_CHUNK_ROWS,
+    progress: Optional[Progress] = None,
+    engine: str = CSV_ENGINE,
+) -> int:
+    """Stream grocery items to csv chunksize rows at a time, returning number of rows written.
+
+    Only one chunk is held at once so items can be any iterable, output is the same as items_to_csv whichever engine writes it.
+    Rows go to a temporary file synced then swapped in for path once complete, so a failed write leaves path untouched.
+    If progress given, each chunk reports rows written out of number of items, 0 if items has no length.
+    """
+    _check_engine(engine)
+    if engine == PANDAS_ENGINE:
+        import pandas as pd
+
+    total = len(items) if isinstance(items, Sized) else 0
+    temp = Path(path).with_name(Path(path).name + ".tmp")
+    rows = 0
+    try:
+        with open(temp, "w", newline="", encoding=CSV_ENCODING) as csv_file:
+            writer = csv.writer(csv_file, lineterminator=os.linesep)
+            if engine == CSV_ENGINE:
+                writer.writerow(ITEM_FIELDS)
+            for chunk in _chunks(items, chunksize):
+                columns = _item_columns(chunk)
+                if engine == CSV_ENGINE:
+                    writer.writerows(zip(*columns.values()))
+                else:
+                    pd.DataFrame(columns, columns=ITEM_FIELDS).to_csv(
+                        csv_file, index=False, header=rows == 0
+                    )
+                rows += len(chunk)
+                if progress is not None:
+                    progress(rows, total)
+            if rows == 0 and engine == PANDAS_ENGINE:
+                pd.DataFrame(columns=ITEM_FIELDS).to_csv(csv_file, index=False)
+            csv_file.flush()
+            os.fsync(csv_file.fileno())
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+    return rows
+
+
+def _check_engine(engine: str) -> None:
+    """Raise ValueError if engine is not one of ENGINES."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown csv engine {engine!r}, expected one of {ENGINES}")
+
+
+def _item_columns(item_list: Sequence[Item]) -> dict[str, list]:
+    """Pull each item field out as a column of csv values, enums as lowercase value and strings lowercased.
+
+    Prices are written as floats whatever number they hold, as pandas writes a float column, so 2 is written 2.0.
+    """
+    columns: dict[str, list] = {}
+    for key in ITEM_FIELDS:
+        values = list(map(attrgetter(key), item_list))
+        if key in VAL_ENUM_MAP:
+            columns[key] = [CSV_ENUM_VALUES[value] for value in values]
+        elif Item.__annotations__[key] is str:
+            columns[key] = [value.lower() for value in values]
+        elif Item.__annotations__[key] is float:
+            columns[key] = list(map(float, values))
+        else:
+            columns[key] = values
+    return columns
+
+
+def _chunks(items: Iterable[Item], chunksize: int) -> Iterator[list[Item]]:
+    """Split items into lists of at most chunksize items."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
@@ -44,7 +44,7 @@ class GrocerArea(Enum):
     PRODUCE = "PRODUCE"
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """Class object for single grocery item."""
 
@@ -60,3 +60,11 @@ class Item:
         if not isinstance(item, Item):
             return NotImplemented
         return self.name == item.name
+
+
+ITEM_ENUMS: dict[str, type[Enum]] = {
+    "priority": Priority,
+    "supply": Supply,
+    "grocer_area": GrocerArea,
+    "kitchen_area": KitchenArea,
+}
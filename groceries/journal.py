@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Optional
+
+from groceries.grocer_list import DELETE, PUT, GroceryList
+from groceries.io import CSV_ENUM_VALUES, VAL_ENUM_MAP, items_to_csv_chunked
+from groceries.item import Item
+
+SYNC_RECORDS: int = 64
+SYNC_SECONDS: float = 1.0
+COMPACT_RECORDS: int = 2000
+ROTATED_SUFFIX: str = ".old"
+
+
+class Journal:
+    """Append only log of grocery list mutations, replayed over the last csv snapshot on startup.
+
+    Each put or delete is a JSON line flushed on write, but only fsynced once sync_records records
+    or sync_seconds have passed since last fsync. Values are written as the csv snapshot writes them.
+    Once compact_records records pile up the journal is rotated aside and folded into a fresh
+    snapshot on a background thread, the rotated journal being dropped once the snapshot is in place.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        snapshot: Path,
+        sync_records: int = SYNC_RECORDS,
+        sync_seconds: float = SYNC_SECONDS,
+        compact_records: int = COMPACT_RECORDS,
+    ) -> None:
+        self.path = path
+        self.snapshot = snapshot
+        self.rotated = path.with_name(path.name + ROTATED_SUFFIX)
+        self.sync_records = sync_records
+        self.sync_seconds = sync_seconds
+        self.compact_records = compact_records
+        self.records = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.compactor: Optional[threading.Thread] = None
+        self.written: Optional[tuple[int, int]] = None
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def replay(self, grocery: GroceryList) -> int:
+        """Apply rotated then current journal records to grocery list, returning number applied.
+
+        Puts update items in place or add them, unreadable lines such as one torn by a crash are skipped.
+        Names are journaled lowercased, as the csv snapshot writes them, so are matched ignoring case.
+        """
+        applied = 0
+        folded: dict[str, str] = {}
+        for path in [self.rotated, self.path]:
+            if not path.exists():
+                continue
+            with open(path, encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    try:
+                        record = json.loads(line)
+                        item = _record_item(record)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    item = replace(item, name=_listed_name(grocery, item.name, folded))
+                    if record["op"] == PUT:
+                        grocery.update(item)
+                    else:
+                        grocery.delete(item)
+                    applied += 1
+                    if path == self.path:
+                        self.records += 1
+        return applied
+
+    def record(self, op: str, item: Item) -> None:
+        """Append put or delete of item, fsyncing if enough records or time since last fsync."""
+        self.file.write(json.dumps(_item_record(op, item)) + "\n")
+        self.file.flush()
+        self.records += 1
+        self.unsynced += 1
+        if (
+            self.unsynced >= self.sync_records
+            or time.monotonic() - self.last_sync >= self.sync_seconds
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force records written so far to disk."""
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def needs_compaction(self) -> bool:
+        """Check journal is past compaction size and no compaction is already running."""
+        return self.records >= self.compact_records and not self.compacting()
+
+    def compacting(self) -> bool:
+        """Check background compaction is running."""
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def compact(self, items: list[Item]) -> None:
+        """Fold journal into snapshot of items, the current state of the grocery list.
+
+        Journal is rotated aside, appending to any rotated journal a failed compaction left, and started afresh.
+        Snapshot is written on a background thread, then rotated journal dropped.
+        Waits on any compaction still running first, so two never write the snapshot at once.
+        """
+        if self.compacting():
+            self.compactor.join()
+        self.sync()
+        self.file.close()
+        if self.rotated.exists():
+            with open(self.rotated, "a", encoding="utf-8") as rotated_file:
+                rotated_file.write(self.path.read_text(encoding="utf-8"))
+                rotated_file.flush()
+                os.fsync(rotated_file.fileno())
+            self.path.unlink()
+        else:
+            os.replace(self.path, self.rotated)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.records = 0
+        self.compactor = threading.Thread(
+            target=self._write_snapshot, args=(items,), name="journal-compaction"
+        )
+        self.compactor.start()
+
+    def _write_snapshot(self, items: list[Item]) -> None:
+        """Write items to snapshot through a synced temporary csv, then drop rotated journal.
+
+        Modification time and size of snapshot as written are kept, so a watcher of it can tell the write apart
+        from edits other programs make.
+        """
+        items_to_csv_chunked(items, self.snapshot)
+        stat = os.stat(self.snapshot)
+        self.written = stat.st_mtime_ns, stat.st_size
+        self.rotated.unlink()
+
+    def close(self) -> None:
+        """Sync and close journal, waiting on any running compaction."""
+        self.sync()
+        self.file.close()
+        if self.compactor is not None:
+            self.compactor.join()
+
+
+def _listed_name(grocery: GroceryList, name: str, folded: dict[str, str]) -> str:
+    """Name of item on grocery list whose name is name ignoring case, name itself if there is none.
+
+    Names on list are folded into folded, lowercase to name, in one pass once a lookup of the exact name misses.
+    """
+    if name in grocery.items:
+        return name
+    if not folded:
+        folded.update((listed.lower(), listed) for listed in grocery.items)
+    return folded.get(name.lower(), name)
+
+
+def _item_record(op: str, item: Item) -> dict[str, Any]:
+    """Journal record of operation on item, values as written to csv."""
+    return {
+        "op": op,
+        "name": item.name.lower(),
+        "price": item.price,
+        **{key: CSV_ENUM_VALUES[getattr(item, key)] for key in VAL_ENUM_MAP},
+    }
+
+
+def _record_item(record: dict[str, Any]) -> Item:
+    """Item a journal record was written from."""
+    if record["op"] not in (PUT, DELETE):
+        raise ValueError(f"Unknown journal operation {record['op']!r}.")
+    return Item(
+        name=record["name"],
+        price=float(record["price"]),
+        **{key: enum[record[key].upper()] for key, enum in VAL_ENUM_MAP.items()},
+    )
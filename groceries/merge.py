@@ -0,0 +1,137 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional, Sequence, Union
+
+from groceries.columnar import ENUM_CODES, ItemColumns, ItemView
+from groceries.io import CSV_ENGINE, ItemParseError, items_from_csv
+from groceries.item import Item
+
+FIRST: str = "first"
+LATEST: str = "latest"
+MAX_PRIORITY: str = "max_priority"
+MAX_SUPPLY: str = "max_supply"
+CSV_PATTERN: str = "*.csv"
+
+Resolver = Callable[[Item, Item], Item]
+
+
+class MergeError(ValueError):
+    """Raised when a file to merge cannot be parsed, naming the file."""
+
+
+@dataclass(frozen=True)
+class FileReport:
+    """How one merged file was parsed: its items and seconds spent parsing it in its worker."""
+
+    path: Path
+    items: int
+    seconds: float
+
+
+@dataclass
+class MergeResult:
+    """Items merged by name, in order first seen, with a report per file and how many name conflicts were resolved."""
+
+    items: list[Item] = field(default_factory=list)
+    files: list[FileReport] = field(default_factory=list)
+    conflicts: int = 0
+    seconds: float = 0.0
+
+
+def keep_first(kept: Item, incoming: Item) -> Item:
+    """Item from the earliest file wins."""
+    return kept
+
+
+def keep_latest(kept: Item, incoming: Item) -> Item:
+    """Item from the latest file wins."""
+    return incoming
+
+
+def max_priority(kept: Item, incoming: Item) -> Item:
+    """Item bought most often wins, WEEKLY over MONTHLY and so on, latest file winning ties."""
+    if ENUM_CODES[kept.priority] < ENUM_CODES[incoming.priority]:
+        return kept
+    return incoming
+
+
+def max_supply(kept: Item, incoming: Item) -> Item:
+    """Item best supplied wins, EXTRA over SUPPLIED and so on, latest file winning ties."""
+    if ENUM_CODES[kept.supply] > ENUM_CODES[incoming.supply]:
+        return kept
+    return incoming
+
+
+POLICIES: dict[str, Resolver] = {
+    FIRST: keep_first,
+    LATEST: keep_latest,
+    MAX_PRIORITY: max_priority,
+    MAX_SUPPLY: max_supply,
+}
+
+
+def merge_csvs(
+    paths: Sequence[Path],
+    policy: Union[str, Resolver] = LATEST,
+    workers: Optional[int] = None,
+    engine: str = CSV_ENGINE,
+) -> MergeResult:
+    """Parse csv files of grocery items in parallel then merge them by name, files being earliest first.
+
+    Files are parsed in a process pool of workers processes, as many as cores if None, or in this process
+    if there is one file or one worker, each file merged as soon as it and the files before it are parsed.
+    Items of the same name are resolved by policy, a name in POLICIES or a function taking the item
+    kept so far and one from a later file and returning the winner or a new item.
+    Raises MergeError naming the first file in order that failed to parse.
+    """
+    resolve = POLICIES[policy] if isinstance(policy, str) else policy
+    paths = [Path(path) for path in paths]
+    parallel = len(paths) > 1 and workers != 1
+    began = perf_counter()
+    result = MergeResult()
+    merged: dict[str, Item] = {}
+    with ProcessPoolExecutor(workers) if parallel else nullcontext() as pool:
+        if parallel:
+            parses = [pool.submit(_parse_file, path, engine).result for path in paths]
+        else:
+            parses = [partial(_parse_file, path, engine) for path in paths]
+        for path, parse in zip(paths, parses):
+            try:
+                columns, seconds = parse()
+            except ItemParseError as err:
+                raise MergeError(f"{path}: {err}") from err
+            result.files.append(FileReport(path, len(columns), seconds))
+            for view in columns:
+                kept = merged.get(view.name)
+                if kept is None:
+                    merged[view.name] = view
+                else:
+                    merged[view.name] = resolve(kept, view)
+                    result.conflicts += 1
+    result.items = [
+        item.to_item() if isinstance(item, ItemView) else item
+        for item in merged.values()
+    ]
+    result.seconds = perf_counter() - began
+    return result
+
+
+def merge_directory(
+    directory: Path, pattern: str = CSV_PATTERN, **kwargs
+) -> MergeResult:
+    """Merge csv files in directory matching pattern as merge_csvs does, least recently modified first."""
+    paths = sorted(
+        Path(directory).glob(pattern), key=lambda path: path.stat().st_mtime_ns
+    )
+    return merge_csvs(paths, **kwargs)
+
+
+def _parse_file(path: Path, engine: str) -> tuple[ItemColumns, float]:
+    """Parse csv file into columns, which pickle far smaller than items, with seconds taken."""
+    began = perf_counter()
+    columns = ItemColumns(items_from_csv(path, engine=engine))
+    return columns, perf_counter() - began
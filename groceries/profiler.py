@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator
+
+ROLLING_SAMPLES: int = 500
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+
+
+class Profiler:
+    """Opt in timings of named operations and counts of named events.
+
+    Each operation keeps its last ROLLING_SAMPLES durations, reported as rolling percentiles in milliseconds.
+    Recording is locked, so operations may be timed from worker threads as well as the Tk thread.
+    """
+
+    def __init__(self, samples: int = ROLLING_SAMPLES) -> None:
+        self.samples = samples
+        self.timings: dict[str, deque[float]] = {}
+        self.calls: Counter[str] = Counter()
+        self.counts: Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one run of operation name taking seconds."""
+        with self.lock:
+            if name not in self.timings:
+                self.timings[name] = deque(maxlen=self.samples)
+            self.timings[name].append(seconds)
+            self.calls[name] += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to event count name."""
+        with self.lock:
+            self.counts[name] += amount
+
+    def set_count(self, name: str, value: int) -> None:
+        """Set event count name to value, for counts sampled rather than added to."""
+        with self.lock:
+            self.counts[name] = value
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time the body of a with block as a run of operation name, whether or not it raises."""
+        began = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - began)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Function calling func with each call timed as a run of operation name."""
+
+        @wraps(func)
+        def timed_func(*args: Any, **kwargs: Any) -> Any:
+            with self.timed(name):
+                return func(*args, **kwargs)
+
+        return timed_func
+
+    def instrument(self, obj: Any, names: Iterable[str], prefix: str = "") -> None:
+        """Replace each named method of obj, on obj alone, with one timed as prefix plus its name.
+
+        Done before methods are handed out as callbacks, callbacks given out later go through the timed methods.
+        """
+        for name in names:
+            setattr(obj, name, self.wrap(prefix + name, getattr(obj, name)))
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Rolling percentiles, mean and max of each operation in milliseconds, with its total calls."""
+        with self.lock:
+            timings = {name: sorted(times) for name, times in self.timings.items()}
+            calls = dict(self.calls)
+        return {
+            name: {
+                "calls": calls[name],
+                **{f"p{pct}": _percentile(times, pct) * 1000 for pct in PERCENTILES},
+                "mean": sum(times) / len(times) * 1000,
+                "max": times[-1] * 1000,
+            }
+            for name, times in sorted(timings.items())
+        }
+
+    def report(self) -> dict[str, Any]:
+        """Stats of every operation and every event count."""
+        with self.lock:
+            counts = dict(sorted(self.counts.items()))
+        return {"timings": self.stats(), "counts": counts}
+
+    def dump(self, path: Path) -> None:
+        """Write report as JSON to path through a temporary file, so readers never see half a report."""
+        temp = Path(path).with_name(Path(path).name + ".tmp")
+        temp.write_text(json.dumps(self.report(), indent=2) + "\n")
+        os.replace(temp, path)
+
+    def summary(self) -> str:
+        """Report as lines of text, one per operation then one of counts."""
+        report = self.report()
+        lines = [
+            f"{name:<24} n={stats['calls']:<6} "
+            + " ".join(f"p{pct}={stats[f'p{pct}']:.1f}" for pct in PERCENTILES)
+            + f" max={stats['max']:.1f} ms"
+            for name, stats in report["timings"].items()
+        ]
+        if report["counts"]:
+            lines.append(
+                " ".join(f"{name}={count}" for name, count in report["counts"].items())
+            )
+        return "\n".join(lines)
+
+
+def _percentile(times: list[float], pct: int) -> float:
+    """Nearest rank percentile of sorted times."""
+    rank = max(0, -(-len(times) * pct // 100) - 1)
+    return times[rank]
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from enum import Enum
+from typing import Collection, Hashable, Optional
+
+from groceries.item import Item
+
+QUERY_CACHE_SIZE: int = 32
+
+QueryKey = tuple[Hashable, ...]
+
+
+class QueryCache:
+    """Least recently used cache of query results, each tagged with the grocery list generation it was made at.
+
+    An entry made at an older generation than asked for is stale, counted as a miss and dropped.
+    Holds at most maxsize results, evicting least recently used first, a maxsize of 0 caching nothing.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[QueryKey, tuple[int, list[Item]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, key: QueryKey, generation: int) -> Optional[list[Item]]:
+        """Result cached for key at generation, None if not cached or stale."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != generation:
+            del self.entries[key]
+            self.stale += 1
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: QueryKey, generation: int, result: list[Item]) -> None:
+        """Cache result for key at generation, evicting least recently used results over maxsize."""
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = (generation, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached result, keeping statistics."""
+        self.entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Hits, misses, stale entries dropped, evictions and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+        }
+
+
+def query_key(
+    filters: dict[str, Optional[Collection[Enum]]],
+    search: str,
+    order: Optional[tuple[str, ...]] = None,
+) -> QueryKey:
+    """Cache key of a query, each field filter as a frozenset so member order does not matter."""
+    return (
+        *(
+            None if members is None else frozenset(members)
+            for members in filters.values()
+        ),
+        search,
+        order,
+    )
@@ -0,0 +1,166 @@
+import heapq
+from collections import Counter, defaultdict
+from typing import Callable, Iterable, Optional
+
+GRAM_SIZE: int = 3
+FUZZY_LIMIT: int = 20
+FUZZY_CANDIDATES: int = 100
+FUZZY_ERROR_RATIO: float = 0.34
+
+
+class SearchIndex:
+    """Substring search over item names through trigram postings.
+
+    Each name is posted under every trigram it contains, so names containing a term are among
+    the intersection of postings of the term's trigrams. Candidates are then checked by plain substring test.
+    Terms shorter than a trigram have no postings to narrow by and scan every name.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names: set[str] = set()
+        self.postings: defaultdict[str, set[str]] = defaultdict(set)
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """Post name under each of its trigrams."""
+        self.names.add(name)
+        for gram in trigrams(name):
+            self.postings[gram].add(name)
+
+    def delete(self, name: str) -> None:
+        """Remove name from postings of each of its trigrams, dropping postings left empty."""
+        self.names.discard(name)
+        for gram in trigrams(name):
+            posting = self.postings[gram]
+            posting.discard(name)
+            if not posting:
+                del self.postings[gram]
+
+    def search(self, term: str) -> set[str]:
+        """Names containing term as a substring."""
+        if len(term) < GRAM_SIZE:
+            return {name for name in self.names if term in name}
+        grams = trigrams(term)
+        if not all(gram in self.postings for gram in grams):
+            return set()
+        postings = sorted((self.postings[gram] for gram in grams), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return {name for name in candidates if term in name}
+
+    def fuzzy(
+        self,
+        term: str,
+        limit: int = FUZZY_LIMIT,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> list[str]:
+        """Names closest to a possibly misspelled term, best first, at most limit of them.
+
+        Candidates are the FUZZY_CANDIDATES accepted names sharing most trigrams with term, at least
+        min_shared_trigrams of them, shorter names kept on ties so a short exact match is not cut,
+        then ranked by rank_fuzzy.
+        Terms shorter than a trigram take the shortest names containing them as candidates.
+        """
+        grams = trigrams(term)
+        if grams:
+            shared: Counter[str] = Counter()
+            for gram in grams:
+                shared.update(self.postings.get(gram, ()))
+            min_shared = min_shared_trigrams(term)
+            candidates = heapq.nlargest(
+                FUZZY_CANDIDATES,
+                (
+                    (name, count)
+                    for name, count in shared.items()
+                    if count >= min_shared and (accept is None or accept(name))
+                ),
+                key=_candidate_key,
+            )
+        else:
+            candidates = [
+                (name, 0)
+                for name in heapq.nsmallest(
+                    FUZZY_CANDIDATES,
+                    (
+                        name
+                        for name in self.search(term)
+                        if accept is None or accept(name)
+                    ),
+                    key=len,
+                )
+            ]
+        return rank_fuzzy(term, candidates, limit)
+
+
+def max_fuzzy_distance(term: str) -> int:
+    """Most edits a fuzzy match of term may be away from it, FUZZY_ERROR_RATIO edits per character."""
+    return int(len(term) * FUZZY_ERROR_RATIO)
+
+
+def min_shared_trigrams(term: str) -> int:
+    """Fewest trigrams a fuzzy match of term can share with it, as an edit breaks at most GRAM_SIZE trigrams."""
+    return len(trigrams(term)) - GRAM_SIZE * max_fuzzy_distance(term)
+
+
+def _candidate_key(candidate: tuple[str, int]) -> tuple[int, int]:
+    """Key keeping candidates sharing more trigrams with a term, then shorter names."""
+    name, count = candidate
+    return count, -len(name)
+
+
+def rank_fuzzy(
+    term: str,
+    candidates: Iterable[tuple[str, int]],
+    limit: int = FUZZY_LIMIT,
+) -> list[str]:
+    """Best limit candidate names for term, given with their count of shared trigrams, best first.
+
+    Names are ranked by edit distance to the closest part of the name through a heap bounded to limit,
+    the worst distance kept bounding the scoring of later candidates once the heap is full.
+    Names over max_fuzzy_distance edits away are dropped.
+    Ties go to names sharing more trigrams, then to shorter names.
+    """
+    max_distance = max_fuzzy_distance(term)
+    worst_first: list[tuple[int, int, int, str]] = []
+    for name, count in candidates:
+        bound = max_distance
+        if len(worst_first) == limit:
+            bound = min(bound, -worst_first[0][0])
+        distance = substring_distance(term, name, bound)
+        if distance > bound:
+            continue
+        rank = (-distance, count, -len(name), name)
+        if len(worst_first) < limit:
+            heapq.heappush(worst_first, rank)
+        else:
+            heapq.heappushpop(worst_first, rank)
+    ranked = sorted(worst_first, reverse=True)
+    return [name for *_, name in ranked]
+
+
+def trigrams(text: str) -> set[str]:
+    """Distinct substrings of text that are GRAM_SIZE characters long."""
+    return {
+        text[start : start + GRAM_SIZE] for start in range(len(text) - GRAM_SIZE + 1)
+    }
+
+
+def substring_distance(term: str, text: str, bound: Optional[int] = None) -> int:
+    """Fewest character edits turning term into some substring of text.
+
+    If bound given, gives up with bound + 1 as soon as distance must exceed bound.
+    """
+    previous = [0] * (len(text) + 1)
+    for row, term_char in enumerate(term, start=1):
+        if bound is not None and min(previous) > bound:
+            return bound + 1
+        current = [row]
+        for diagonal, above, text_char in zip(previous, previous[1:], text):
+            cost = diagonal if term_char == text_char else diagonal + 1
+            if above + 1 < cost:
+                cost = above + 1
+            if current[-1] + 1 < cost:
+                cost = current[-1] + 1
+            current.append(cost)
+        previous = current
+    return min(previous)
@@ -0,0 +1,176 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from groceries.columnar import CODE_TYPE, ENUM_CODES, ENUM_MEMBERS, PRICE_TYPE, ItemView
+from groceries.item import Item
+
+MAGIC: bytes = b"GROCSNAP"
+VERSION: int = 1
+HEADER = struct.Struct("<8sHcxIQ")
+OFFSET_TYPE: str = "Q"
+NAME_ENCODING: str = "utf-8"
+BYTE_ORDER: bytes = b"<" if sys.byteorder == "little" else b">"
+ENUM_LAYOUT: int = zlib.crc32(
+    "|".join(
+        f"{key}:{','.join(member.name for member in members)}"
+        for key, members in ENUM_MEMBERS.items()
+    ).encode()
+)
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this build can read."""
+
+
+class Snapshot:
+    """Items of a binary columnar snapshot file, mapped into memory rather than read.
+
+    File is a header, then a float64 price column, name end offsets into the name blob, a byte code
+    column per enum field as ItemColumns codes them, then the utf-8 name blob. Columns are memoryviews
+    over the mapping, so opening costs the same however many items, rows being read as ItemView objects
+    and fields decoded only when accessed. Mapping stays open as long as the snapshot or any view of it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size < HEADER.size:
+                raise SnapshotError(f"{path} too short for a snapshot header.")
+            self.mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        offsets = None
+        try:
+            self.rows = _read_header(self.mmap)
+            with memoryview(self.mmap) as view:
+                start = HEADER.size
+                self.prices = _column(view, start, PRICE_TYPE, self.rows)
+                start += self.prices.nbytes
+                offsets = _column(view, start, OFFSET_TYPE, self.rows)
+                start += offsets.nbytes
+                self.codes: dict[str, memoryview] = {}
+                for key in ENUM_MEMBERS:
+                    self.codes[key] = _column(view, start, CODE_TYPE, self.rows)
+                    start += self.rows
+            self.names = SnapshotNames(self.mmap, offsets, start)
+            if start + (offsets[-1] if self.rows else 0) != len(self.mmap):
+                raise SnapshotError(f"{path} name blob does not match its offsets.")
+        except BaseException:
+            if offsets is not None:
+                offsets.release()
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> ItemView:
+        if not -len(self) <= row < len(self):
+            raise IndexError(f"row {row} out of range for {len(self)} items.")
+        return ItemView(self, row % len(self))
+
+    def __iter__(self) -> Iterator[ItemView]:
+        return (ItemView(self, row) for row in range(len(self)))
+
+    def close(self) -> None:
+        """Release columns and unmap file, views of the snapshot must not be used afterwards."""
+        for column in (
+            getattr(self, "prices", None),
+            *getattr(self, "codes", {}).values(),
+        ):
+            if column is not None:
+                column.release()
+        if hasattr(self, "names"):
+            self.names.offsets.release()
+        self.mmap.close()
+
+
+class SnapshotNames:
+    """Names column of a snapshot, each name decoded from the blob on access."""
+
+    __slots__ = ("mmap", "offsets", "start")
+
+    def __init__(self, data: mmap.mmap, offsets: memoryview, start: int) -> None:
+        self.mmap = data
+        self.offsets = offsets
+        self.start = start
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, row: int) -> str:
+        begin = self.start + (self.offsets[row - 1] if row else 0)
+        end = self.start + self.offsets[row]
+        return self.mmap[begin:end].decode(NAME_ENCODING)
+
+
+def write_snapshot(items: Iterable[Item], path: Path) -> int:
+    """Write items as a snapshot file at path, returning number of items written.
+
+    Columns are built in memory then written to a temporary file synced then swapped in for path,
+    so a failed write leaves path untouched.
+    """
+    prices = array(PRICE_TYPE)
+    offsets = array(OFFSET_TYPE)
+    codes = {key: bytearray() for key in ENUM_MEMBERS}
+    names: list[bytes] = []
+    end = 0
+    for item in items:
+        prices.append(item.price)
+        name = item.name.encode(NAME_ENCODING)
+        names.append(name)
+        end += len(name)
+        offsets.append(end)
+        for key, column in codes.items():
+            column.append(ENUM_CODES[getattr(item, key)])
+
+    temp = Path(path).with_name(Path(path).name + ".tmp")
+    try:
+        with open(temp, "wb") as snapshot_file:
+            snapshot_file.write(
+                HEADER.pack(MAGIC, VERSION, BYTE_ORDER, ENUM_LAYOUT, len(prices))
+            )
+            snapshot_file.write(prices.tobytes())
+            snapshot_file.write(offsets.tobytes())
+            for column in codes.values():
+                snapshot_file.write(column)
+            snapshot_file.write(b"".join(names))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+    return len(prices)
+
+
+def snapshot_is_current(snapshot: Path, source: Path) -> bool:
+    """Whether snapshot exists and was written after source was last modified."""
+    try:
+        return snapshot.stat().st_mtime_ns > source.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _read_header(data: mmap.mmap) -> int:
+    """Check snapshot header, returning number of rows. Raises SnapshotError if unreadable."""
+    magic, version, byte_order, layout, rows = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("File is not a grocery snapshot.")
+    if version != VERSION:
+        raise SnapshotError(f"Snapshot version {version}, expected {VERSION}.")
+    if byte_order != BYTE_ORDER:
+        raise SnapshotError("Snapshot written with a different byte order.")
+    if layout != ENUM_LAYOUT:
+        raise SnapshotError("Snapshot written with different enum members.")
+    return rows
+
+
+def _column(view: memoryview, start: int, typecode: str, rows: int) -> memoryview:
+    """Column of rows values of typecode starting at byte start. Raises SnapshotError if file too short."""
+    end = start + rows * array(typecode).itemsize
+    if end > len(view):
+        raise SnapshotError("Snapshot truncated.")
+    return view[start:end].cast(typecode)
@@ -0,0 +1,81 @@
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator, Optional, Sequence
+
+from groceries.columnar import ENUM_CODES
+from groceries.item import ITEM_ENUMS, Item
+
+SORT_FIELDS: tuple[str, ...] = ("name", "price", *ITEM_ENUMS)
+ORDER_SORT_RATIO: int = 8
+
+Order = tuple[str, ...]
+SortKey = tuple
+
+
+class SortIndex:
+    """Keys of items kept sorted in one order, maintained by bisection on each add, delete and update.
+
+    Order ends with name, so keys are unique and every item has one place in the order.
+    """
+
+    def __init__(self, order: Order, items: Iterable[Item] = ()) -> None:
+        self.order = order
+        self.keys: list[SortKey] = sorted(sort_key(item, order) for item in items)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, item: Item) -> None:
+        """Insert item's key at its place in the order."""
+        insort(self.keys, sort_key(item, self.order))
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add many items, sorting their keys in with one sort rather than inserting each."""
+        self.keys += (sort_key(item, self.order) for item in items)
+        self.keys.sort()
+
+    def delete(self, item: Item) -> None:
+        """Remove key of item as it was when added."""
+        key = sort_key(item, self.order)
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+
+    def update(self, old_item: Item, item: Item) -> None:
+        """Move item from old item's place to its own, nothing done if its key did not change."""
+        if sort_key(old_item, self.order) != sort_key(item, self.order):
+            self.delete(old_item)
+            self.add(item)
+
+    def names(self) -> Iterator[str]:
+        """Names of items in order."""
+        return (key[-1] for key in self.keys)
+
+
+def sort_order(fields: Optional[Sequence[str]]) -> Optional[Order]:
+    """Order sorting by fields in turn then by name, None if no fields given. Raises ValueError on unknown fields.
+
+    Names being unique, fields after name never break a tie and are dropped.
+    """
+    if not fields:
+        return None
+    unknown = [field for field in fields if field not in SORT_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Cannot sort by {', '.join(unknown)}, expected {SORT_FIELDS}."
+        )
+    order = tuple(dict.fromkeys(fields))
+    if "name" in order:
+        return order[: order.index("name") + 1]
+    return (*order, "name")
+
+
+def sort_key(item: Item, order: Order) -> SortKey:
+    """Key of item in order, enum members ranked by their place in their Enum."""
+    return tuple(
+        (
+            ENUM_CODES[getattr(item, field)]
+            if field in ITEM_ENUMS
+            else getattr(item, field)
+        )
+        for field in order
+    )
@@ -0,0 +1,364 @@
+import os
+import sqlite3
+from enum import Enum
+from pathlib import Path
+from typing import Collection, Iterable, Iterator, Optional
+
+from groceries.aggregates import Aggregates
+from groceries.constants import EMPTY
+from groceries.grocer_list import (
+    ADD,
+    DELETE,
+    UPDATE,
+    BaseGroceryList,
+    DuplicateItemError,
+    filter_fields,
+)
+from groceries.io import VAL_ENUM_MAP, Progress, items_from_csv
+from groceries.item import ITEM_ENUMS, GrocerArea, Item, KitchenArea, Priority, Supply
+from groceries.query_cache import QUERY_CACHE_SIZE
+from groceries.search_index import (
+    FUZZY_CANDIDATES,
+    FUZZY_LIMIT,
+    GRAM_SIZE,
+    min_shared_trigrams,
+    rank_fuzzy,
+    trigrams,
+)
+from groceries.sort_index import Order
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    price REAL NOT NULL,
+    priority TEXT NOT NULL,
+    supply TEXT NOT NULL,
+    grocer_area TEXT NOT NULL,
+    kitchen_area TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_priority ON items (priority);
+CREATE INDEX IF NOT EXISTS items_supply ON items (supply);
+CREATE INDEX IF NOT EXISTS items_grocer_area ON items (grocer_area);
+CREATE INDEX IF NOT EXISTS items_kitchen_area ON items (kitchen_area);
+CREATE TABLE IF NOT EXISTS name_trigrams (
+    gram TEXT NOT NULL,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS name_trigrams_gram ON name_trigrams (gram, seq);
+CREATE INDEX IF NOT EXISTS name_trigrams_seq ON name_trigrams (seq);
+"""
+ITEM_COLUMNS: str = "name, price, priority, supply, grocer_area, kitchen_area"
+ORDER_TERMS: dict[str, str] = {
+    "name": "name",
+    "price": "price",
+    **{
+        key: f"CASE {key} "
+        + " ".join(
+            f"WHEN '{member.name}' THEN {code}" for code, member in enumerate(enum)
+        )
+        + " END"
+        for key, enum in ITEM_ENUMS.items()
+    },
+}
+ORDER_SCHEMA: str = "".join(
+    f"CREATE INDEX IF NOT EXISTS items_order_{field} ON items ({term}, name);\n"
+    for field, term in ORDER_TERMS.items()
+    if field != "name"
+)
+
+
+class SqliteGroceryList(BaseGroceryList):
+    """Grocery items stored in a SQLite database file, filters and searches run as indexed SQL.
+
+    Items are ordered by their rowid seq, enums stored by member name. Name trigrams are kept in
+    their own indexed table, so substring and fuzzy searches narrow their candidates in SQL.
+    Connection may be opened on a worker thread and handed over, but is never used from two threads at once.
+    """
+
+    def __init__(
+        self, path: Path, outpath: Path, cache_size: int = QUERY_CACHE_SIZE
+    ) -> None:
+        super().__init__(cache_size)
+        self.path = path
+        self.outpath = outpath
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA + ORDER_SCHEMA)
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path: Path,
+        path: Path,
+        outpath: Path,
+        progress: Optional[Progress] = None,
+    ) -> "SqliteGroceryList":
+        """Migrate csv database of grocery items into SQLite database at path, reporting csv read progress.
+
+        Items are migrated into a temporary database renamed to path once all are in, so a csv that fails
+        to parse leaves no database at path. A name the csv repeats is migrated as its last row, in place
+        of its first, as GroceryList loads it.
+        """
+        temp = Path(path).with_name(Path(path).name + ".tmp")
+        temp.unlink(missing_ok=True)
+        migrating = cls(temp, outpath)
+        try:
+            items = {item.name: item for item in items_from_csv(csv_path, progress)}
+            migrating.extend(items.values())
+        except BaseException:
+            migrating.close()
+            temp.unlink()
+            raise
+        migrating.close()
+        os.replace(temp, path)
+        return cls(path, outpath)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        """Add many items in a single transaction, nothing added if any name is already taken."""
+        added = []
+        try:
+            with self.connection:
+                for item in items:
+                    self._insert(item)
+                    added.append(item)
+        except sqlite3.IntegrityError as err:
+            raise DuplicateItemError(str(err)) from err
+        for item in added:
+            self._notify(ADD, item)
+
+    def close(self) -> None:
+        """Close database connection."""
+        self.connection.close()
+
+    def __iter__(self) -> Iterator[Item]:
+        cursor = self.connection.execute(
+            f"SELECT {ITEM_COLUMNS} FROM items ORDER BY seq"
+        )
+        return map(_row_item, cursor)
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def get(self, name: str) -> Optional[Item]:
+        row = self.connection.execute(
+            f"SELECT {ITEM_COLUMNS} FROM items WHERE name = ?", (name,)
+        ).fetchone()
+        return None if row is None else _row_item(row)
+
+    def add(self, item: Item) -> None:
+        try:
+            with self.connection:
+                self._insert(item)
+        except sqlite3.IntegrityError as err:
+            raise DuplicateItemError(
+                f"{item.name!r} is already on the grocery list."
+            ) from err
+        self._notify(ADD, item)
+
+    def delete(self, item: Item) -> None:
+        with self.connection:
+            change = self._remove(item)
+        if change is not None:
+            self._notify(*change)
+
+    def update(self, item: Item) -> None:
+        with self.connection:
+            change = self._put(item)
+        self._notify(*change)
+
+    def _ingest(self, batches: Iterable[list[Item]]) -> int:
+        """Each batch put in a single transaction, its changes notified once it commits."""
+        ingested = 0
+        for batch in batches:
+            with self.connection:
+                changes = [self._put(item) for item in batch]
+            for change in changes:
+                self._notify(*change)
+            ingested += len(batch)
+        return ingested
+
+    def _apply_batch(self, ops: Iterable[tuple[str, Item]]) -> None:
+        """Every mutation in a single transaction, observers told once it commits, nothing applied if one raises."""
+        with self.connection:
+            changes = [
+                self._remove(item) if op == DELETE else self._put(item)
+                for op, item in ops
+            ]
+        for change in changes:
+            if change is not None:
+                self._notify(*change)
+
+    def _remove(self, item: Item) -> Optional[tuple]:
+        """Delete item row and its name trigrams, within caller's transaction, returning notify args, None if not on list."""
+        row = self.connection.execute(
+            f"SELECT seq, {ITEM_COLUMNS} FROM items WHERE name = ?", (item.name,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("DELETE FROM items WHERE seq = ?", row[:1])
+        self.connection.execute("DELETE FROM name_trigrams WHERE seq = ?", row[:1])
+        return DELETE, _row_item(row[1:])
+
+    def _put(self, item: Item) -> tuple:
+        """Update item row in place or insert it, within caller's transaction, returning notify args of the change."""
+        old_item = self.get(item.name) if self.observers else None
+        cursor = self.connection.execute(
+            "UPDATE items SET price = ?, priority = ?, supply = ?, "
+            "grocer_area = ?, kitchen_area = ? WHERE name = ?",
+            (*_item_row(item)[1:], item.name),
+        )
+        if cursor.rowcount == 0:
+            self._insert(item)
+            return ADD, item
+        return UPDATE, item, old_item
+
+    def _insert(self, item: Item) -> None:
+        """Insert item row and its name trigrams, within caller's transaction."""
+        cursor = self.connection.execute(
+            f"INSERT INTO items ({ITEM_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            _item_row(item),
+        )
+        self.connection.executemany(
+            "INSERT INTO name_trigrams (gram, seq) VALUES (?, ?)",
+            [(gram, cursor.lastrowid) for gram in trigrams(item.name)],
+        )
+
+    def _query(
+        self,
+        filters: dict[str, Optional[Collection[Enum]]],
+        search: str,
+        order: Optional[Order] = None,
+    ) -> list[Item]:
+        """Filters run against the enum column indexes, search term first narrowed by name trigrams.
+
+        Sorted by enum member position through ORDER_TERMS, single field orders read off their expression indexes.
+        """
+        clauses, params = _filter_clauses(filters)
+        if len(search) >= GRAM_SIZE:
+            grams = trigrams(search)
+            clauses.append(
+                "seq IN (SELECT seq FROM name_trigrams "
+                f"WHERE gram IN ({_marks(grams)}) GROUP BY seq HAVING COUNT(*) = ?)"
+            )
+            params += [*grams, len(grams)]
+        if search:
+            clauses.append("instr(name, ?) > 0")
+            params.append(search)
+        cursor = self.connection.execute(
+            f"SELECT {ITEM_COLUMNS} FROM items {_where(clauses)} ORDER BY {_order_by(order)}",
+            params,
+        )
+        return list(map(_row_item, cursor))
+
+    def _aggregates(self, filters: dict[str, Optional[Collection[Enum]]]) -> Aggregates:
+        """Filtered rows counted and summed per combination of enum members in one GROUP BY."""
+        clauses, params = _filter_clauses(filters)
+        enum_columns = ", ".join(ITEM_ENUMS)
+        cursor = self.connection.execute(
+            f"SELECT {enum_columns}, COUNT(*), SUM(price) FROM items "
+            f"{_where(clauses)} GROUP BY {enum_columns}",
+            params,
+        )
+        aggregates = Aggregates()
+        for *members, count, total in cursor:
+            cell = tuple(
+                enum[member] for enum, member in zip(ITEM_ENUMS.values(), members)
+            )
+            aggregates.add_cell(cell, count, total)
+        return aggregates
+
+    def fuzzy_search(
+        self,
+        term: str,
+        limit: int = FUZZY_LIMIT,
+        priorities: Optional[Collection[Priority]] = None,
+        supplies: Optional[Collection[Supply]] = None,
+        kitchen: Optional[Collection[KitchenArea]] = None,
+        grocer: Optional[Collection[GrocerArea]] = None,
+    ) -> list[Item]:
+        """Candidates sharing most trigrams with term are counted and filtered in SQL, then ranked in python."""
+        clauses, params = _filter_clauses(
+            filter_fields(priorities, supplies, kitchen, grocer)
+        )
+        grams = trigrams(term)
+        if grams:
+            clauses.append(f"gram IN ({_marks(grams)})")
+            candidates = self.connection.execute(
+                "SELECT name, COUNT(*) AS shared "
+                "FROM name_trigrams JOIN items USING (seq) "
+                f"{_where(clauses)} GROUP BY seq HAVING shared >= ? "
+                "ORDER BY shared DESC, length(name) LIMIT ?",
+                [*params, *grams, min_shared_trigrams(term), FUZZY_CANDIDATES],
+            )
+        else:
+            clauses.append("instr(name, ?) > 0")
+            candidates = self.connection.execute(
+                f"SELECT name, 0 FROM items {_where(clauses)} "
+                "ORDER BY length(name) LIMIT ?",
+                [*params, term, FUZZY_CANDIDATES],
+            )
+        names = rank_fuzzy(term, candidates.fetchall(), limit)
+        items = {
+            item.name: item
+            for item in map(
+                _row_item,
+                self.connection.execute(
+                    f"SELECT {ITEM_COLUMNS} FROM items WHERE name IN ({_marks(names)})",
+                    names,
+                ),
+            )
+        }
+        return [items[name] for name in names]
+
+
+def _item_row(item: Item) -> tuple:
+    """Row values of item in ITEM_COLUMNS order, enums by member name."""
+    return (
+        item.name,
+        item.price,
+        item.priority.name,
+        item.supply.name,
+        item.grocer_area.name,
+        item.kitchen_area.name,
+    )
+
+
+def _row_item(row: tuple) -> Item:
+    """Item from row of ITEM_COLUMNS values."""
+    name, price, *members = row
+    return Item(
+        name,
+        price,
+        *(enum[member] for enum, member in zip(VAL_ENUM_MAP.values(), members)),
+    )
+
+
+def _filter_clauses(
+    filters: dict[str, Optional[Collection[Enum]]],
+) -> tuple[list[str], list]:
+    """SQL conditions and their parameters keeping rows with allowed members in each filtered column."""
+    clauses: list[str] = []
+    params: list = []
+    for key, members in filters.items():
+        if members is None:
+            continue
+        clauses.append(f"{key} IN ({_marks(members)})")
+        params += [member.name for member in members]
+    return clauses, params
+
+
+def _order_by(order: Optional[Order]) -> str:
+    """ORDER BY terms of order, rowid seq if None."""
+    if order is None:
+        return "seq"
+    return ", ".join(ORDER_TERMS[field] for field in order)
+
+
+def _where(clauses: list[str]) -> str:
+    """WHERE clause requiring all conditions, empty if none."""
+    return f"WHERE {' AND '.join(clauses)}" if clauses else EMPTY
+
+
+def _marks(values: Collection) -> str:
+    """Comma separated parameter marks, one per value."""
+    return ", ".join("?" * len(values))
@@ -0,0 +1,153 @@
+import csv
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from groceries.constants import EMPTY
+from groceries.grocer_list import DELETE, PUT, BaseGroceryList
+from groceries.io import CSV_READ_ENCODING, ITEM_FIELDS, items_from_rows
+from groceries.item import Item
+
+
+@dataclass
+class CsvChanges:
+    """Changes a csv file edit made to a grocery list: items added, items updated and names deleted."""
+
+    added: list[Item] = field(default_factory=list)
+    updated: list[Item] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.deleted)
+
+
+class CsvWatcher:
+    """Source csv of a grocery list, polled for edits by other programs through its modification time and size.
+
+    Lines of the file as last read are kept, so an edit is diffed line by line and only new or changed lines
+    are split as csv and parsed into items, each row taken to be one line as items_to_csv_chunked writes them.
+    Only rows the edit changed are applied to the grocery list, in one batch, so edits made on the list and not
+    yet written back to the file are not undone, and items already as the file has them are left alone.
+    Writes the grocery list makes to the file itself, as journal compaction does, are read but not applied.
+    Names are matched ignoring case, names being lowercased when the list is written to csv.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.stamp = _stamp(path)
+        self.header, lines = _read_lines(path) or (EMPTY, [])
+        self.lines: set[str] = set(lines)
+
+    def changed(self) -> bool:
+        """Check file was modified, replaced or removed since last read."""
+        return _stamp(self.path) != self.stamp
+
+    def poll(self, grocery: BaseGroceryList) -> Optional[CsvChanges]:
+        """Apply rows changed since file was last read to grocery list, None if file is unchanged or gone.
+
+        Raises ItemParseError if a changed row does not parse, say if caught half written, the rows being
+        read again once the file next changes. A file caught truncated or half written before its rows, being
+        empty, not decoding or not headed by every item field, is skipped the same way, rather than taken
+        as deleting every item. While grocery list is writing the file itself, the file is left to be read
+        on a later poll.
+        """
+        if not self.changed() or grocery.writing(self.path):
+            return None
+        self.stamp = _stamp(self.path)
+        if self.stamp is None:
+            return None
+        read = _read_lines(self.path)
+        if read is None or sorted(_split(read[0])) != sorted(ITEM_FIELDS):
+            return None
+        header, lines = read
+        if self.stamp == grocery.written(self.path):
+            self.header, self.lines = header, set(lines)
+            return CsvChanges()
+        if header == self.header:
+            fresh = [line for line in lines if line not in self.lines]
+            gone = self.lines.difference(lines)
+        else:
+            fresh, gone = lines, self.lines
+        items = items_from_rows(list(csv.reader(fresh)), _split(header))
+        changes = CsvChanges()
+        ops: list[tuple[str, Item]] = []
+        fresh_names = {item.name.lower() for item in items}
+        lookup = _lookup(grocery)
+        for name in _names(gone, _split(self.header)):
+            item = None if name.lower() in fresh_names else lookup(name)
+            if item is not None:
+                ops.append((DELETE, item))
+                changes.deleted.append(item.name)
+        for item in items:
+            current = lookup(item.name)
+            if current is None:
+                ops.append((PUT, item))
+                changes.added.append(item)
+                continue
+            item = replace(item, name=current.name)
+            if _fields(current) != _fields(item):
+                ops.append((PUT, item))
+                changes.updated.append(item)
+        if ops:
+            grocery.apply_batch(ops)
+        self.header, self.lines = header, set(lines)
+        return changes
+
+
+def _stamp(path: Path) -> Optional[tuple[int, int]]:
+    """Modification time and size of file, None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_lines(path: Path) -> Optional[tuple[str, list[str]]]:
+    """Header line and non blank lines of csv file, line endings of any platform stripped.
+
+    None if file is gone or does not decode, as when caught part way through a multibyte character.
+    """
+    try:
+        with open(path, encoding=CSV_READ_ENCODING) as csv_file:
+            header, *lines = csv_file.read().split("\n")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    return header, [line for line in lines if line]
+
+
+def _split(line: str) -> list[str]:
+    """Fields of a csv line."""
+    return next(csv.reader([line]), [])
+
+
+def _names(lines: Iterable[str], header: list[str]) -> set[str]:
+    """Names in csv lines under header, rows too short to have one skipped."""
+    if "name" not in header:
+        return set()
+    column = header.index("name")
+    return {row[column] for row in csv.reader(lines) if len(row) > column}
+
+
+def _lookup(grocery: BaseGroceryList) -> Callable[[str], Optional[Item]]:
+    """Function getting item of grocery list by name ignoring case, None if not on list.
+
+    Names are only folded to lowercase, in one pass over the list, once a lookup of the exact name misses.
+    """
+    folded: dict[str, Item] = {}
+
+    def lookup(name: str) -> Optional[Item]:
+        item = grocery.get(name)
+        if item is None:
+            if not folded:
+                folded.update((item.name.lower(), item) for item in grocery)
+            item = folded.get(name.lower())
+        return item
+
+    return lookup
+
+
+def _fields(item: Item) -> tuple:
+    """Every field of item, for telling items of same name apart."""
+    return tuple(getattr(item, key) for key in ITEM_FIELDS)
@@ -0,0 +1,59 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generic, TypeVar
+
+from groceries.io import Progress
+
+T = TypeVar("T")
+
+PROGRESS: str = "progress"
+DONE: str = "done"
+FAILED: str = "failed"
+CANCELLED: str = "cancelled"
+EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="groceries-worker")
+
+
+class Cancelled(Exception):
+    """Raised from a task's progress callback once the task is cancelled, unwinding the task."""
+
+
+class BackgroundTask(Generic[T]):
+    """Function run on a worker thread, its progress and outcome queued as events for the Tk thread to poll.
+
+    The function is passed the task's progress callback, which raises Cancelled once cancel is requested,
+    so cancelling takes effect at the task's next progress report.
+    """
+
+    def __init__(self, func: Callable[[Progress], T]) -> None:
+        self.events: queue.SimpleQueue[tuple[str, Any]] = queue.SimpleQueue()
+        self.cancelled = threading.Event()
+        self.future = EXECUTOR.submit(self._run, func)
+
+    def _run(self, func: Callable[[Progress], T]) -> None:
+        """Run function, queuing its result, failure or cancellation as last event."""
+        try:
+            self.events.put((DONE, func(self.progress)))
+        except Cancelled:
+            self.events.put((CANCELLED, None))
+        except Exception as err:
+            self.events.put((FAILED, err))
+
+    def progress(self, done: int, total: int) -> None:
+        """Queue progress of done out of total units, raising Cancelled if task was cancelled."""
+        if self.cancelled.is_set():
+            raise Cancelled
+        self.events.put((PROGRESS, (done, total)))
+
+    def cancel(self) -> None:
+        """Ask task to stop at its next progress report."""
+        self.cancelled.set()
+
+    def poll(self) -> list[tuple[str, Any]]:
+        """Take all events queued since last poll without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
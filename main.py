@@ -1,19 +1,153 @@
-from pathlib import Path
+from time import perf_counter
 
-from groceries.grocer_list import GroceryList
-from groceries.gui import GUI
-from groceries.io import items_from_csv
+STARTED = perf_counter()
+
+import sys  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+from functools import partial  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Callable  # noqa: E402
+
+from groceries.grocer_list import BaseGroceryList, GroceryList  # noqa: E402
+from groceries.gui import GUI  # noqa: E402
+from groceries.history import HISTORY_DEPTH  # noqa: E402
+from groceries.io import Progress, items_from_csv  # noqa: E402
+from groceries.item import Item  # noqa: E402
+from groceries.journal import Journal  # noqa: E402
+from groceries.profiler import Profiler  # noqa: E402
+from groceries.snapshot import (  # noqa: E402
+    Snapshot,
+    SnapshotError,
+    snapshot_is_current,
+    write_snapshot,
+)
+from groceries.sqlite_list import SqliteGroceryList  # noqa: E402
+
+IMPORTED = perf_counter()
 
 DATABASE = Path(__file__).parent / "data" / "grocery_list.csv"
 OUTPATH = DATABASE.parent / "test_list.csv"
+JOURNAL = DATABASE.with_suffix(".journal")
+SNAPSHOT = DATABASE.with_suffix(".snapshot")
 
 
-def main():
-    """Main function."""
-    grocer_items = items_from_csv(DATABASE)
+def load_items(progress: Progress) -> list[Item]:
+    """Items of csv database, mapped from its binary snapshot if that is newer than the csv.
+
+    Otherwise items are read from the csv and the snapshot regenerated from them for next start.
+    """
+    if snapshot_is_current(SNAPSHOT, DATABASE):
+        try:
+            return list(Snapshot(SNAPSHOT))
+        except SnapshotError:
+            pass
+    grocer_items = items_from_csv(DATABASE, progress)
+    write_snapshot(grocer_items, SNAPSHOT)
+    return grocer_items
+
+
+def load_csv(progress: Progress) -> GroceryList:
+    """Load csv database, replay edits since its last snapshot from its journal, then journal edits as made."""
+    grocer_items = load_items(progress)
     grocer_list = GroceryList(item_list=grocer_items, outpath=OUTPATH)
-    gui = GUI(grocer_list)
+    journal = Journal(JOURNAL, snapshot=DATABASE)
+    journal.replay(grocer_list)
+    grocer_list.journal = journal
+    return grocer_list
+
+
+def load_sqlite(path: Path, progress: Progress) -> SqliteGroceryList:
+    """Open SQLite database at path, migrating csv database into it if new."""
+    if path.exists():
+        return SqliteGroceryList(path, outpath=OUTPATH)
+    return SqliteGroceryList.from_csv(
+        DATABASE, path, outpath=OUTPATH, progress=progress
+    )
+
+
+def report_time(stage: str, seconds: float) -> None:
+    """Print how long a startup stage took to stderr."""
+    print(f"startup {stage}: {seconds * 1000:.1f} ms", file=sys.stderr)
+
+
+def timed_loader(
+    loader: Callable[[Progress], BaseGroceryList],
+) -> Callable[[Progress], BaseGroceryList]:
+    """Wrap loader to report how long it took once it returns."""
+
+    def load(progress: Progress) -> BaseGroceryList:
+        began = perf_counter()
+        grocery = loader(progress)
+        report_time("load", perf_counter() - began)
+        return grocery
+
+    return load
+
+
+def main():
+    """Main function.
+
+    Window opens on an empty grocery list straight away, the grocery list being loaded in the background.
+    By default that is the csv database with its journal, with --sqlite the given SQLite database.
+    With --profile, GUI callbacks and grocery list operations are timed into a debug panel.
+    With --watch, edits other programs make to the csv database are applied as the GUI runs.
+    With --history-depth, that many changes can be undone with Ctrl+Z, HISTORY_DEPTH by default.
+    With --timing, startup is reported broken down into import, load and first paint, first paint being
+    the time from start until the empty window's first idle redraw.
+    """
+    parser = ArgumentParser(description="Grocery List UI")
+    parser.add_argument(
+        "--sqlite", type=Path, help="SQLite database to keep grocery list in."
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Print startup time broken down into import, load and first paint.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time GUI callbacks and grocery list operations, shown in a debug panel.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Apply edits other programs make to the csv database while open.",
+    )
+    parser.add_argument(
+        "--history-depth",
+        type=int,
+        default=HISTORY_DEPTH,
+        help="Number of changes that can be undone with Ctrl+Z and redone with Ctrl+Y.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        help="File to dump profile to as JSON every few seconds, implies --profile.",
+    )
+    args = parser.parse_args()
+
+    profiler = Profiler() if args.profile or args.profile_json else None
+    gui = GUI(
+        GroceryList(item_list=[], outpath=OUTPATH),
+        profiler=profiler,
+        profile_path=args.profile_json,
+        watch=DATABASE if args.watch else None,
+        history_depth=args.history_depth,
+    )
+    loader = load_csv if args.sqlite is None else partial(load_sqlite, args.sqlite)
+    if args.timing:
+        report_time("import", IMPORTED - STARTED)
+        loader = timed_loader(loader)
+
+        def first_paint() -> None:
+            gui.update_idletasks()
+            report_time("first paint", perf_counter() - STARTED)
+
+        gui.after_idle(first_paint)
+    gui.load(loader)
     gui.mainloop()
+    gui.grocery.close()
 
 
 if __name__ == "__main__":
@@ -6,5 +6,6 @@ setup(
     description="Grocery List UI",
     author="Joseh Palombo",
     packages=["groceries"],
-    setup_requires=["pandas"],
+    python_requires=">=3.10",
+    extras_require={"pandas": ["pandas"]},
 )